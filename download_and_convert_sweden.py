@@ -1,12 +1,15 @@
 import os
 import requests
 import rasterio
+from rasterio.io import MemoryFile
 import numpy as np
 from PIL import Image
 from dotenv import load_dotenv
 import time
+import threading
 import json
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import multiprocessing
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -29,6 +32,13 @@ except ImportError:
             fcntl.flock(self.fd, fcntl.LOCK_UN)
             self.fd.close()
 
+# --- OPTIONAL JIT ---
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 load_dotenv()
 
 # --- CONFIGURATION ---
@@ -39,6 +49,7 @@ LM_STAC_HOJD_URL = "https://api.lantmateriet.se/stac-hojd/v1/search"
 BASE_DOWNLOAD_DIR = "Karta_Hojd_Sverige"
 VRT_FILENAME = "mosaik_hojd.vrt"
 STATE_FILENAME = "mosaik_state.json"
+STATE_LOG_FILENAME = "mosaik_state.log"  # Append-only entries since last snapshot
 TOKEN_CACHE_FILE = "token_cache.json"
 TOKEN_LOCK_FILE = "token_cache.lock"
 STATE_LOCK_FILE = "mosaik_state.lock" # New lock for state file
@@ -46,9 +57,28 @@ STATE_LOCK_FILE = "mosaik_state.lock" # New lock for state file
 ERROR_WAIT_TIME = 600
 MAX_RETRIES = 5
 TOKEN_REFRESH_INTERVAL = 3000  # 50 minutes
+TOKEN_REFRESH_MARGIN = 300  # Go back to the token file this long before expiry
+STATE_SNAPSHOT_INTERVAL = 500  # Completions between full state snapshots
+HTTP_POOL_SIZE = 32  # Keep-alive connections, at least the number of download threads
+GDAL_CACHE_MB = 256  # Upper bound for GDAL's block cache per worker
+PENDING_PER_DOWNLOAD_THREAD = 2  # Downloaded GeoTIFFs held in memory awaiting conversion
 
 UA_HEADERS = {'User-Agent': 'ElevationDownloader/1.0'}
 
+# Terrain-RGB encoding: value = (height + 10000) * 10, packed into 24 bits
+TERRAIN_MAX_VALUE = 16777215
+SCALE_STRIP_ROWS = 64  # Rows per pass in the NumPy fallback encoder
+
+# Shared HTTP session, created on first use
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# In-memory copy of the cached token, so most calls skip the file lock
+_TOKEN = {"value": None, "ts": 0}
+
+# Per-worker scratch buffers, reused across tiles of the same shape
+_BUFFERS = {}
+
 def get_runtime_config():
     current_hour = datetime.now().hour
     if 7 <= current_hour < 18:
@@ -58,13 +88,22 @@ def get_runtime_config():
         return n_workers, 0.0
 
 def get_session():
-    session = requests.Session()
-    retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retries)
-    session.mount("https://", adapter)
-    return session
+    """Returns the shared session, so TLS connections are reused across requests."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+                                  max_retries=retries)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
 
 def get_access_token():
+    if _TOKEN["value"] and time.time() - _TOKEN["ts"] < TOKEN_REFRESH_INTERVAL - TOKEN_REFRESH_MARGIN:
+        return _TOKEN["value"]
+
     lock = FileLock(TOKEN_LOCK_FILE)
     with lock:
         if os.path.exists(TOKEN_CACHE_FILE):
@@ -72,7 +111,9 @@ def get_access_token():
                 with open(TOKEN_CACHE_FILE, 'r') as f:
                     data = json.load(f)
                     if time.time() - data.get('timestamp', 0) < TOKEN_REFRESH_INTERVAL:
-                        return data.get('access_token')
+                        _TOKEN["value"] = data.get('access_token')
+                        _TOKEN["ts"] = data.get('timestamp', 0)
+                        return _TOKEN["value"]
             except:
                 pass
 
@@ -93,15 +134,25 @@ def get_access_token():
                 )
                 response.raise_for_status()
                 token = response.json()["access_token"]
+                timestamp = time.time()
                 
                 with open(TOKEN_CACHE_FILE, 'w') as f:
-                    json.dump({'access_token': token, 'timestamp': time.time()}, f)
+                    json.dump({'access_token': token, 'timestamp': timestamp}, f)
+                _TOKEN["value"] = token
+                _TOKEN["ts"] = timestamp
                 return token
             except Exception as e:
                 print(f"Token-fel (försök {attempt+1}): {e}")
                 time.sleep(10)
         return None
 
+def invalidate_access_token():
+    """Drops the cached token (memory and file), e.g. after a 401."""
+    _TOKEN["value"] = None
+    if os.path.exists(TOKEN_CACHE_FILE):
+        try: os.remove(TOKEN_CACHE_FILE)
+        except: pass
+
 def generate_folder_name(filename):
     try:
         parts = filename.split('_')
@@ -111,7 +162,61 @@ def generate_folder_name(filename):
         pass
     return "other"
 
-def process_file(file_info, delay=0):
+# --- TERRAIN ENCODING ---
+def get_buffer(shape, dtype):
+    """Returns a scratch array for this worker, allocated once per shape/dtype."""
+    key = (tuple(shape), np.dtype(dtype).str)
+    buf = _BUFFERS.get(key)
+    if buf is None:
+        buf = np.empty(shape, dtype=dtype)
+        _BUFFERS[key] = buf
+    return buf
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _scale_heights_jit(src, has_nodata, nodata, out):
+        for i in prange(src.shape[0]):
+            for j in range(src.shape[1]):
+                v = src[i, j]
+                if has_nodata and v == nodata:
+                    out[i, j] = 0
+                    continue
+                # float32 throughout, matching the NumPy path bit for bit
+                s = (np.float32(v) + np.float32(10000)) * np.float32(10)
+                if s < 0:
+                    s = np.float32(0)
+                elif s > np.float32(TERRAIN_MAX_VALUE):
+                    s = np.float32(TERRAIN_MAX_VALUE)
+                out[i, j] = np.uint32(s)
+
+def _scale_heights_numpy(src, nodata, out):
+    # Row strips keep the float temporary and nodata mask cache-sized
+    # instead of allocating them at full tile size
+    for r0 in range(0, src.shape[0], SCALE_STRIP_ROWS):
+        strip = src[r0:r0 + SCALE_STRIP_ROWS]
+        scaled = (strip + np.float32(10000)) * 10
+        if nodata is not None:
+            scaled[strip == nodata] = 0
+        np.clip(scaled, 0, TERRAIN_MAX_VALUE, out=scaled)
+        out[r0:r0 + SCALE_STRIP_ROWS] = scaled
+
+def scale_heights(src, nodata, out):
+    """
+    Encodes heights as Terrain-RGB integers into the uint32 array `out`.
+    Nodata pixels map to 0. Uses a single fused pass when numba is available.
+    """
+    if HAS_NUMBA:
+        has_nodata = nodata is not None
+        _scale_heights_jit(src, has_nodata, np.float32(nodata) if has_nodata else np.float32(0), out)
+    else:
+        _scale_heights_numpy(src, nodata, out)
+    return out
+
+def fetch_file(file_info, delay=0):
+    """
+    Downloads one GeoTIFF into memory. Runs on a download thread, since it is
+    I/O bound. Returns a "fetched" job for convert_file, or a skipped/error result.
+    """
     # Unpack extra info passed in
     asset_href, headers, bbox = file_info
     
@@ -122,7 +227,6 @@ def process_file(file_info, delay=0):
     target_dir = os.path.join(BASE_DOWNLOAD_DIR, folder_name)
     os.makedirs(target_dir, exist_ok=True)
     
-    tif_path = os.path.join(target_dir, filename)
     png_path = os.path.join(target_dir, png_filename)
     relative_path = f"{folder_name}/{png_filename}"
 
@@ -143,9 +247,7 @@ def process_file(file_info, delay=0):
             with session.get(asset_href, headers=headers, stream=True, timeout=60) as r:
                 if r.status_code == 401:
                     # Force token refresh
-                    if os.path.exists(TOKEN_CACHE_FILE):
-                        try: os.remove(TOKEN_CACHE_FILE)
-                        except: pass
+                    invalidate_access_token()
                     new_token = get_access_token()
                     if new_token:
                         headers["Authorization"] = f"Bearer {new_token}"
@@ -154,91 +256,279 @@ def process_file(file_info, delay=0):
                         raise Exception("Kunde inte förnya token vid 401")
 
                 r.raise_for_status()
-                with open(tif_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=16384):
-                        f.write(chunk)
-            
-            # Conversion
-            with rasterio.open(tif_path) as src:
-                height_data = src.read(1)
-                nodata = src.nodata
-
-            if nodata is not None:
-                height_data[height_data == nodata] = -10000
-
-            data_scaled = (height_data + 10000) * 10
-            data_scaled = np.clip(data_scaled, 0, 16777215).astype(np.uint32)
+                r.raw.decode_content = True
+                tif_bytes = r.raw.read()
 
-            r_ch = (data_scaled >> 16).astype(np.uint8)
-            g_ch = ((data_scaled >> 8) & 0xFF).astype(np.uint8)
-            b_ch = (data_scaled & 0xFF).astype(np.uint8)
-
-            img = Image.fromarray(np.dstack((r_ch, g_ch, b_ch)), mode='RGB')
-            img.save(png_path, "PNG", optimize=False)
-            
-            os.remove(tif_path)
-            
-            # SUCCESS: Return all info needed to append to VRT immediately
-            return {"status": "downloaded", "path": relative_path, "bbox": bbox}
+            return {"status": "fetched", "tif_bytes": tif_bytes, "png_path": png_path,
+                    "path": relative_path, "bbox": bbox}
 
         except Exception as e:
-            if os.path.exists(tif_path): os.remove(tif_path)
             if attempt == MAX_RETRIES - 1:
                 return {"status": "error", "msg": str(e), "path": relative_path}
             time.sleep(10)
 
     return {"status": "error", "msg": "Okänt fel", "path": relative_path}
 
+def convert_file(job):
+    """
+    Encodes a fetched GeoTIFF as a Terrain-RGB PNG. Runs in a worker process,
+    since it is CPU bound. The GeoTIFF is decoded from memory; it never
+    touches the disk.
+    """
+    try:
+        with rasterio.Env(GDAL_CACHEMAX=GDAL_CACHE_MB), \
+                MemoryFile(job["tif_bytes"]) as mem, mem.open() as src:
+            height_data = get_buffer((src.height, src.width), src.dtypes[0])
+            src.read(1, out=height_data)
+            nodata = src.nodata
+
+        data_scaled = scale_heights(
+            height_data, nodata, get_buffer(height_data.shape, np.uint32)
+        )
+
+        # Each little-endian uint32 is laid out as B, G, R, 0 in memory,
+        # so PIL can unpack the buffer as BGRX without per-channel copies
+        h, w = data_scaled.shape
+        packed = data_scaled.astype('<u4', copy=False)
+        img = Image.frombuffer('RGB', (w, h), packed, 'raw', 'BGRX', 0, 1)
+        img.save(job["png_path"], "PNG", optimize=False)
+    except Exception as e:
+        if os.path.exists(job["png_path"]): os.remove(job["png_path"])
+        return {"status": "error", "msg": str(e), "path": job["path"]}
+
+    # SUCCESS: Return all info needed to append to VRT immediately
+    return {"status": "downloaded", "path": job["path"], "bbox": job["bbox"]}
+
+def download_and_convert(download_queue, n_workers, delay, convert_pool):
+    """
+    Fetches on a thread pool and hands each GeoTIFF to the conversion pool as
+    soon as it lands. Yields one result per queued item, in completion order.
+    Downloads are held in memory until converted, so a download thread waits
+    while too many are pending.
+    """
+    results = queue.Queue()
+    pending = threading.BoundedSemaphore(n_workers * PENDING_PER_DOWNLOAD_THREAD)
+
+    def finish(res):
+        pending.release()
+        results.put(res)
+
+    def fetch(item):
+        pending.acquire()
+        return fetch_file(item, delay)
+
+    def on_converted(future, path):
+        try:
+            finish(future.result())
+        except Exception as e:  # e.g. a crashed worker process
+            finish({"status": "error", "msg": str(e), "path": path})
+
+    def on_fetched(future, item):
+        try:
+            res = future.result()
+        except Exception as e:
+            finish({"status": "error", "msg": str(e), "path": item[0]})
+            return
+        if res["status"] != "fetched":
+            finish(res)
+            return
+        try:
+            convert_future = convert_pool.submit(convert_file, res)
+        except Exception as e:
+            finish({"status": "error", "msg": str(e), "path": res["path"]})
+            return
+        convert_future.add_done_callback(lambda f: on_converted(f, res["path"]))
+
+    with ThreadPoolExecutor(max_workers=n_workers) as download_pool:
+        for item in download_queue:
+            future = download_pool.submit(fetch, item)
+            future.add_done_callback(lambda f, item=item: on_fetched(f, item))
+        for _ in range(len(download_queue)):
+            yield results.get()
+
 # --- STATE MANAGEMENT ---
 def load_vrt_state():
+    """Loads the last snapshot and replays any entries logged after it."""
+    state = {}
     path = os.path.join(BASE_DOWNLOAD_DIR, STATE_FILENAME)
     if os.path.exists(path):
         try:
-            with open(path, 'r', encoding='utf-8') as f: return json.load(f)
+            with open(path, 'r', encoding='utf-8') as f: state = json.load(f)
         except: pass
-    return {}
 
-def save_vrt_state_safe(state):
-    """Saves state atomically using FileLock."""
+    log_path = os.path.join(BASE_DOWNLOAD_DIR, STATE_LOG_FILENAME)
+    if os.path.exists(log_path):
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn line from an interrupted write
+                state[entry["path"]] = entry
+    return state
+
+def open_state_log():
+    os.makedirs(BASE_DOWNLOAD_DIR, exist_ok=True)
+    log_path = os.path.join(BASE_DOWNLOAD_DIR, STATE_LOG_FILENAME)
+    state_log = open(log_path, 'a', encoding='utf-8')
+    if state_log.tell() > 0:
+        with open(log_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                state_log.write("\n")  # Terminate a torn last line
+    return state_log
+
+def append_state_entry(state_log, entry):
+    """Records a single state entry in O(1), without rewriting the snapshot."""
+    state_log.write(json.dumps(entry) + "\n")
+    state_log.flush()
+
+def save_vrt_state_safe(state, state_log=None):
+    """Saves a full snapshot atomically using FileLock, then truncates the log."""
     path = os.path.join(BASE_DOWNLOAD_DIR, STATE_FILENAME)
+    tmp_path = path + ".tmp"
     lock = FileLock(STATE_LOCK_FILE)
     with lock:
-        with open(path, 'w', encoding='utf-8') as f: 
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(state, f)
-
-def create_vrt_from_state(state, output_path):
-    """Rewrites the VRT file based on current state."""
-    if not state: return
-    tiles = list(state.values())
+        os.replace(tmp_path, path)
+        if state_log is not None:
+            state_log.truncate(0)
+
+def state_extent(state):
+    """Returns [min_x, min_y, max_x, max_y] over all tiles in the state."""
+    extent = [float('inf'), float('inf'), float('-inf'), float('-inf')]
+    for t in state.values():
+        grow_extent(extent, t['bbox'])
+    return extent
+
+def grow_extent(extent, bbox):
+    """Grows the extent in place to include bbox."""
+    if bbox[0] < extent[0]: extent[0] = bbox[0]
+    if bbox[1] < extent[1]: extent[1] = bbox[1]
+    if bbox[2] > extent[2]: extent[2] = bbox[2]
+    if bbox[3] > extent[3]: extent[3] = bbox[3]
+
+VRT_SRS = 'PROJCS["SWEREF99 TM",GEOGCS["SWEREF99",DATUM["SWEREF99",SPHEROID["GRS 1980",6378137,298.257222101]],PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433]],PROJECTION["Transverse_Mercator"],PARAMETER["latitude_of_origin",0],PARAMETER["central_meridian",15],PARAMETER["scale_factor",0.9996],PARAMETER["false_easting",500000],PARAMETER["false_northing",0],UNIT["metre",1]]'
+
+SIMPLE_SOURCE_TEMPLATE = (
+    '    <SimpleSource>\n'
+    '      <SourceFilename relativeToVRT="1">%s</SourceFilename>\n'
+    '      <SourceBand>%d</SourceBand>\n'
+    '      <SrcRect xOff="0" yOff="0" xSize="50000" ySize="50000"/>\n'
+    '      <DstRect xOff="%d" yOff="%d" xSize="50000" ySize="50000"/>\n'
+    '    </SimpleSource>\n'
+)
+
+def simple_source_xml(t, band, min_x, max_y):
+    bbox = t['bbox']
+    return SIMPLE_SOURCE_TEMPLATE % (t["path"], band, int(bbox[0] - min_x), int(max_y - bbox[3]))
+
+def create_vrt_from_state(state, output_path, reserve=0, extent=None):
+    """
+    Rewrites the VRT file based on current state.
+
+    `extent` is the running extent of the state; it is computed here if not
+    given. Each band is followed by `reserve` bytes of whitespace that
+    VrtAppender fills with new sources. Returns the extent and, per band,
+    the byte offsets (next source, end of reserve).
+
+    gdal.BuildVRT is not an option here: the PNGs carry no georeferencing
+    (placement comes from the STAC bbox in the state), and it would have
+    to open every source file, which costs far more than the formatting.
+    """
+    if not state: return None, []
+    tiles = state.values()
     
-    # Calculate global extent
-    min_x = min(t['bbox'][0] for t in tiles)
-    min_y = min(t['bbox'][1] for t in tiles)
-    max_x = max(t['bbox'][2] for t in tiles)
-    max_y = max(t['bbox'][3] for t in tiles)
+    if extent is None:
+        extent = state_extent(state)
+    min_x, min_y, max_x, max_y = extent
     width = int(max_x - min_x)
     height = int(max_y - min_y)
     
-    # Write VRT (Overwrites existing)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(f'<VRTDataset rasterXSize="{width}" rasterYSize="{height}">\n')
-        f.write('  <SRS>PROJCS["SWEREF99 TM",GEOGCS["SWEREF99",DATUM["SWEREF99",SPHEROID["GRS 1980",6378137,298.257222101]],PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433]],PROJECTION["Transverse_Mercator"],PARAMETER["latitude_of_origin",0],PARAMETER["central_meridian",15],PARAMETER["scale_factor",0.9996],PARAMETER["false_easting",500000],PARAMETER["false_northing",0],UNIT["metre",1]]</SRS>\n')
-        f.write(f'  <GeoTransform>{min_x}, 1.0, 0.0, {max_y}, 0.0, -1.0</GeoTransform>\n')
-        for i, color in enumerate(['Red', 'Green', 'Blue'], 1):
-            f.write(f'  <VRTRasterBand dataType="Byte" band="{i}"><ColorInterp>{color}</ColorInterp>\n')
-            for t in tiles:
-                t_min_x, t_min_y, t_max_x, t_max_y = t['bbox']
-                x_off, y_off = int(t_min_x - min_x), int(max_y - t_max_y)
-                f.write(f'    <SimpleSource>\n      <SourceFilename relativeToVRT="1">{t["path"]}</SourceFilename>\n      <SourceBand>{i}</SourceBand>\n      <SrcRect xOff="0" yOff="0" xSize="50000" ySize="50000"/>\n      <DstRect xOff="{x_off}" yOff="{y_off}" xSize="50000" ySize="50000"/>\n    </SimpleSource>\n')
-            f.write(f'  </VRTRasterBand>\n')
-        f.write('</VRTDataset>\n')
+    # Assemble the whole document, then write it (Overwrites existing) in one call
+    parts = [(
+        f'<VRTDataset rasterXSize="{width}" rasterYSize="{height}">\n'
+        f'  <SRS>{VRT_SRS}</SRS>\n'
+        f'  <GeoTransform>{min_x}, 1.0, 0.0, {max_y}, 0.0, -1.0</GeoTransform>\n'
+    ).encode('utf-8')]
+    pos = len(parts[0])
+    band_offsets = []
+    for i, color in enumerate(['Red', 'Green', 'Blue'], 1):
+        band = (
+            f'  <VRTRasterBand dataType="Byte" band="{i}"><ColorInterp>{color}</ColorInterp>\n'
+            + ''.join([simple_source_xml(t, i, min_x, max_y) for t in tiles])
+        ).encode('utf-8')
+        pos += len(band)
+        band_offsets.append((pos, pos + reserve))
+        tail = b' ' * reserve + b'  </VRTRasterBand>\n'
+        pos += len(tail)
+        parts += [band, tail]
+    parts.append(b'</VRTDataset>\n')
+
+    with open(output_path, 'wb') as f:
+        f.write(b''.join(parts))
+    return tuple(extent), band_offsets
+
+class VrtAppender:
+    """
+    Keeps the VRT in sync with the state by writing new sources in place.
+
+    Every band is written with reserved whitespace before its closing tag,
+    so new <SimpleSource> entries cost a seek and a write instead of a full
+    rewrite. The file is rewritten only when a new tile grows the extent
+    (which shifts every DstRect) or a band runs out of reserve.
+    """
+    MIN_RESERVE = 64 * 1024
+    SOURCE_BYTES = 300  # Approximate size of one <SimpleSource> entry
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.extent = None
+        self.band_offsets = []
+        self.pending = []
+
+    def add(self, entry):
+        self.pending.append(entry)
+
+    def flush(self, state, extent):
+        if self.extent != tuple(extent) or not self._append():
+            self.rewrite(state, extent)
+        self.pending = []
+
+    def rewrite(self, state, extent, compact=False):
+        # Leave room for half as many sources again, so rewrites get rarer as it grows
+        reserve = 0 if compact else max(self.MIN_RESERVE, len(state) * self.SOURCE_BYTES // 2)
+        self.extent, self.band_offsets = create_vrt_from_state(state, self.output_path, reserve, extent)
+
+    def _append(self):
+        if not self.pending: return True
+        min_x, min_y, max_x, max_y = self.extent
+
+        chunks = []
+        for i, (band_end, band_limit) in enumerate(self.band_offsets, 1):
+            data = ''.join(simple_source_xml(t, i, min_x, max_y) for t in self.pending).encode('utf-8')
+            if band_end + len(data) > band_limit:
+                return False
+            chunks.append(data)
+
+        with open(self.output_path, 'r+b') as f:
+            for i, data in enumerate(chunks):
+                band_end, band_limit = self.band_offsets[i]
+                f.seek(band_end)
+                f.write(data)
+                self.band_offsets[i] = (band_end + len(data), band_limit)
+        return True
 
 def main():
     if not get_access_token(): return
     
     # Load existing state once at start
     vrt_state = load_vrt_state()
+    extent = state_extent(vrt_state)
+    state_log = open_state_log()
     vrt_path = os.path.join(BASE_DOWNLOAD_DIR, VRT_FILENAME)
+    vrt = VrtAppender(vrt_path)
     
     for lat in range(55, 70):
         current_workers, current_delay = get_runtime_config()
@@ -258,7 +548,7 @@ def main():
                 session = get_session()
                 r = session.post(LM_STAC_HOJD_URL, headers=headers, json={"bbox": bbox_slice, "limit": 10000}, timeout=30)
                 if r.status_code == 401:
-                    if os.path.exists(TOKEN_CACHE_FILE): os.remove(TOKEN_CACHE_FILE)
+                    invalidate_access_token()
                     token = get_access_token()
                     headers["Authorization"] = f"Bearer {token}"
                     continue
@@ -283,45 +573,57 @@ def main():
             # item = (url, headers, bbox)
             download_queue.append((href, UA_HEADERS.copy(), bbox))
 
-        with ProcessPoolExecutor(max_workers=current_workers) as executor:
-            # Submit all
-            futures = {executor.submit(process_file, item, current_delay): item for item in download_queue}
+        # Downloads run on threads; only the Terrain-RGB encoding needs processes
+        with ProcessPoolExecutor(max_workers=current_workers) as convert_pool:
+            results = download_and_convert(download_queue, current_workers, current_delay, convert_pool)
             
-            pbar = tqdm(as_completed(futures), total=len(download_queue))
+            pbar = tqdm(results, total=len(download_queue))
             
             files_since_save = 0
+            files_since_snapshot = 0
             
-            for future in pbar:
-                res = future.result()
-                
+            for res in pbar:
                 # --- LIVE UPDATE LOGIC ---
                 if res["status"] == "downloaded":
                     # 1. Update In-Memory State
+                    is_new = res["path"] not in vrt_state
                     vrt_state[res["path"]] = {"path": res["path"], "bbox": res["bbox"]}
+                    if is_new:
+                        grow_extent(extent, res["bbox"])
+                        vrt.add(vrt_state[res["path"]])
                     
-                    # 2. Update Disk State Immediately (Data Safety)
-                    save_vrt_state_safe(vrt_state)
+                    # 2. Log to Disk Immediately (Data Safety), snapshot periodically
+                    append_state_entry(state_log, vrt_state[res["path"]])
+                    files_since_snapshot += 1
+                    if files_since_snapshot >= STATE_SNAPSHOT_INTERVAL:
+                        save_vrt_state_safe(vrt_state, state_log)
+                        files_since_snapshot = 0
                     
-                    # 3. Regenerate VRT (Operational View)
+                    # 3. Update VRT (Operational View)
                     # We do this every 5 files to avoid excessive IO, or immediately if you prefer
                     files_since_save += 1
                     if files_since_save >= 5:
-                        create_vrt_from_state(vrt_state, vrt_path)
+                        vrt.flush(vrt_state, extent)
                         files_since_save = 0
                         
                 elif res["status"] == "skipped":
                     # Ensure skipped files are also in state (e.g. restart)
                     if res["path"] not in vrt_state:
                          vrt_state[res["path"]] = {"path": res["path"], "bbox": res["bbox"]}
-                         # No need to save immediately for skipped, wait for next batch
+                         append_state_entry(state_log, vrt_state[res["path"]])
+                         grow_extent(extent, res["bbox"])
+                         vrt.add(vrt_state[res["path"]])
                 
                 elif res["status"] == "error":
                     tqdm.write(f"Fel: {res['msg']}")
 
             # Final save/VRT update at end of latitude block
-            save_vrt_state_safe(vrt_state)
-            create_vrt_from_state(vrt_state, vrt_path)
+            save_vrt_state_safe(vrt_state, state_log)
+            vrt.flush(vrt_state, extent)
 
+    # Drop the reserved whitespace from the finished VRT
+    vrt.rewrite(vrt_state, extent, compact=True)
+    state_log.close()
     print("Nedladdning klar.")
 
 if __name__ == "__main__":
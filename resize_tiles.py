@@ -1,13 +1,22 @@
 import os
+import itertools
 import xml.etree.ElementTree as ET
+import numpy as np
 from PIL import Image
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 
+try:
+    import pyvips
+    HAS_PYVIPS = True
+except ImportError:
+    HAS_PYVIPS = False
+
 # --- CONFIGURATION ---
 TEST_MODE = False  # Set to False to process the full catalog
 TEST_LIMIT = 10   # Number of files to process in test mode
-MAX_WORKERS = os.cpu_count()  # Adjust if you want to limit CPU usage
+ENCODE_THREADS = 4  # Tile encodes run concurrently within each worker (encoders release the GIL)
+MAX_WORKERS = max(1, os.cpu_count() // ENCODE_THREADS)  # Adjust if you want to limit CPU usage
 
 DATASETS = [
     {
@@ -15,12 +24,14 @@ DATASETS = [
         "ext": ".webp",
         "slice_size": 500,
         "save_kwargs": {"quality": 80},
+        "vips_options": "[Q=80]",
     },
     {
         "name": "Karta_Hojd_Sverige",
         "ext": ".png",
         "slice_size": 500,
         "save_kwargs": {"compress_level": 6},
+        "vips_options": "[compression=6]",
     }
 ]
 
@@ -31,6 +42,66 @@ def ensure_dir(path):
         except OSError:
             pass # Handle race conditions in multiprocessing
 
+# Per-process encode pool, created on first use
+_ENCODE_POOL = None
+
+def get_encode_pool():
+    global _ENCODE_POOL
+    if _ENCODE_POOL is None:
+        _ENCODE_POOL = ThreadPoolExecutor(max_workers=ENCODE_THREADS)
+    return _ENCODE_POOL
+
+def wait_all(futures):
+    """Wait for every encode, then raise the first failure if any."""
+    errors = [f.exception() for f in futures]
+    for e in errors:
+        if e is not None:
+            raise e
+
+def save_tiles_pil(full_src_path, pending, config):
+    """Encode pending tiles with Pillow from one decoded array."""
+    slice_size = config["slice_size"]
+    with Image.open(full_src_path) as img:
+        # Decode once into an array; tiles are then zero-copy slices of it.
+        arr = np.asarray(img)
+        palette = img.getpalette() if img.mode == "P" else None
+
+    pool = get_encode_pool()
+    futures = []
+    for x, y, full_out_path in pending:
+        tile_arr = arr[y:y + slice_size, x:x + slice_size]
+        if tile_arr.shape[:2] != (slice_size, slice_size):
+            # Edge tile: pad with zeros like Image.crop() does
+            padded = np.zeros((slice_size, slice_size) + arr.shape[2:], dtype=arr.dtype)
+            padded[:tile_arr.shape[0], :tile_arr.shape[1]] = tile_arr
+            tile_arr = padded
+        tile = Image.fromarray(tile_arr)
+        if palette is not None:
+            tile.putpalette(palette)
+        ensure_dir(os.path.dirname(full_out_path))
+        futures.append(pool.submit(tile.save, full_out_path, **config["save_kwargs"]))
+    wait_all(futures)
+
+def save_tiles_vips(img, pending, config):
+    """
+    Encode pending tiles with libvips, which runs the encoders without
+    holding the GIL. dzsave is not used since it imposes its own tile
+    naming and directory layout, which the VRT and resume logic rely on.
+    """
+    slice_size = config["slice_size"]
+    pool = get_encode_pool()
+    futures = []
+    for x, y, full_out_path in pending:
+        w = min(slice_size, img.width - x)
+        h = min(slice_size, img.height - y)
+        tile = img.crop(x, y, w, h)
+        if (w, h) != (slice_size, slice_size):
+            # Edge tile: pad with zeros like Image.crop() does
+            tile = tile.embed(0, 0, slice_size, slice_size)
+        ensure_dir(os.path.dirname(full_out_path))
+        futures.append(pool.submit(tile.write_to_file, full_out_path + config["vips_options"]))
+    wait_all(futures)
+
 def process_single_source_file(source_data):
     """
     Worker function to process a single original image.
@@ -53,35 +124,46 @@ def process_single_source_file(source_data):
         if not os.path.exists(full_src_path):
             return []
 
-        with Image.open(full_src_path) as img:
-            width, height = img.size
-            
-            # Iterate through the image in 500x500 chunks
-            for y in range(0, height, config["slice_size"]):
-                for x in range(0, width, config["slice_size"]):
-                    
-                    # Define new filename: OriginalName_Yoffset_Xoffset.ext
-                    # Example: 646_52_00_0_500.webp
-                    new_filename = f"{base_name}_{y}_{x}{config['ext']}"
-                    new_rel_path = os.path.join(sub_folder, new_filename)
-                    full_out_path = os.path.join(output_dir, new_rel_path)
-                    
-                    # RESUME LOGIC: Skip if file exists
-                    if not os.path.exists(full_out_path):
-                        box = (x, y, x + config["slice_size"], y + config["slice_size"])
-                        tile = img.crop(box)
-                        ensure_dir(os.path.dirname(full_out_path))
-                        tile.save(full_out_path, **config["save_kwargs"])
-                    
-                    # Prepare VRT metadata for this tile
-                    vrt_entries.append({
-                        "filename": new_rel_path,
-                        "src_x": 0, "src_y": 0,
-                        "src_w": config["slice_size"], "src_h": config["slice_size"],
-                        "dst_x": global_x_start + x,
-                        "dst_y": global_y_start + y,
-                        "dst_w": config["slice_size"], "dst_h": config["slice_size"]
-                    })
+        slice_size = config["slice_size"]
+        if HAS_PYVIPS:
+            # Only the header is read here; pixels are decoded on first crop
+            img = pyvips.Image.new_from_file(full_src_path)
+            width, height = img.width, img.height
+        else:
+            with Image.open(full_src_path) as img:
+                width, height = img.size
+
+        # Iterate through the image in 500x500 chunks
+        pending = []
+        for y in range(0, height, slice_size):
+            for x in range(0, width, slice_size):
+                
+                # Define new filename: OriginalName_Yoffset_Xoffset.ext
+                # Example: 646_52_00_0_500.webp
+                new_filename = f"{base_name}_{y}_{x}{config['ext']}"
+                new_rel_path = os.path.join(sub_folder, new_filename)
+                full_out_path = os.path.join(output_dir, new_rel_path)
+                
+                # RESUME LOGIC: Skip if file exists
+                if not os.path.exists(full_out_path):
+                    pending.append((x, y, full_out_path))
+                
+                # Prepare VRT metadata for this tile
+                vrt_entries.append({
+                    "filename": new_rel_path,
+                    "src_x": 0, "src_y": 0,
+                    "src_w": slice_size, "src_h": slice_size,
+                    "dst_x": global_x_start + x,
+                    "dst_y": global_y_start + y,
+                    "dst_w": slice_size, "dst_h": slice_size
+                })
+
+        # Skipped entirely when resuming a source whose tiles all exist.
+        if pending:
+            if HAS_PYVIPS:
+                save_tiles_vips(img, pending, config)
+            else:
+                save_tiles_pil(full_src_path, pending, config)
                     
     except Exception as e:
         print(f"\nError processing {full_src_path}: {e}")
@@ -89,6 +171,38 @@ def process_single_source_file(source_data):
 
     return vrt_entries
 
+def iter_vrt_sources(vrt_path, header):
+    """
+    Stream (src_filename, dst_rect) pairs out of the first VRTRasterBand
+    without building the whole DOM. Header elements needed for the new VRT are
+    collected into `header` as they are seen; sources are freed as soon as they
+    are read. Parsing stops at the end of the first band, so the sources of
+    any further bands are never yielded.
+    """
+    band = None
+    # iterparse only closes a file it opened itself once parsing runs to the
+    # end, so own the handle to release it on the early return as well
+    with open(vrt_path, "rb") as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "VRTDataset":
+                    header["root"] = elem
+                elif elem.tag == "VRTRasterBand":
+                    band = elem
+                    header["dataType"] = elem.get("dataType")
+                continue
+
+            if band is None:
+                continue
+            if elem is band:
+                return
+            if elem.tag == "SimpleSource":
+                yield elem.find("SourceFilename").text, dict(elem.find("DstRect").attrib)
+                elem.clear()
+                band.clear()
+            elif elem.tag == "ColorInterp" and "ColorInterp" not in header:
+                header["ColorInterp"] = elem
+
 def process_dataset(config):
     root_dir = config["name"]
     vrt_path = os.path.join(root_dir, "mosaik.vrt")
@@ -102,25 +216,32 @@ def process_dataset(config):
     print(f"\n--- Processing {root_dir} ---")
     ensure_dir(output_dir)
 
-    # 1. Parse Original VRT to get list of files
-    tree = ET.parse(vrt_path)
-    root = tree.getroot()
-    orig_band = root.find("VRTRasterBand")
-    sources = orig_band.findall("SimpleSource")
+    # 1. Stream sources out of the original VRT
+    header = {}
+    sources = iter_vrt_sources(vrt_path, header)
 
     # 2. Filter for Test Mode
     if TEST_MODE:
-        print(f"TEST MODE: Processing only {TEST_LIMIT} of {len(sources)} files.")
-        sources = sources[:TEST_LIMIT]
+        print(f"TEST MODE: Processing only the first {TEST_LIMIT} files.")
+        sources = itertools.islice(sources, TEST_LIMIT)
 
-    # 3. Prepare Tasks
-    tasks = []
-    for source in sources:
-        src_filename = source.find("SourceFilename").text
-        dst_rect = source.find("DstRect").attrib
-        tasks.append((config, src_filename, dst_rect, root_dir, output_dir))
+    # 3. Execute Parallel Processing, submitting tasks while the VRT is parsed
+    new_sources_list = []
+    
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(process_single_source_file,
+                            (config, src_filename, dst_rect, root_dir, output_dir))
+            for src_filename, dst_rect in sources
+        ]
+        
+        # Process results as they finish with a progress bar
+        for future in tqdm(as_completed(futures), total=len(futures), unit="file"):
+            result = future.result()
+            new_sources_list.extend(result)
 
     # 4. Initialize New VRT Structure (Header)
+    root = header["root"]
     new_root = ET.Element("VRTDataset")
     new_root.set("rasterXSize", root.get("rasterXSize"))
     new_root.set("rasterYSize", root.get("rasterYSize"))
@@ -131,24 +252,12 @@ def process_dataset(config):
             new_root.append(elem)
             
     new_band = ET.SubElement(new_root, "VRTRasterBand")
-    new_band.set("dataType", orig_band.get("dataType"))
+    new_band.set("dataType", header["dataType"])
     new_band.set("band", "1")
-    if orig_band.find("ColorInterp") is not None:
-        new_band.append(orig_band.find("ColorInterp"))
-
-    # 5. Execute Parallel Processing
-    new_sources_list = []
-    
-    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Submit all tasks
-        futures = [executor.submit(process_single_source_file, task) for task in tasks]
-        
-        # Process results as they finish with a progress bar
-        for future in tqdm(as_completed(futures), total=len(tasks), unit="file"):
-            result = future.result()
-            new_sources_list.extend(result)
+    if header.get("ColorInterp") is not None:
+        new_band.append(header["ColorInterp"])
 
-    # 6. Build New VRT from results
+    # 5. Build New VRT from results
     print("Building new VRT index...")
     for entry in new_sources_list:
         sim_source = ET.SubElement(new_band, "SimpleSource")
@@ -170,7 +279,7 @@ def process_dataset(config):
             "xSize": str(entry["dst_w"]), "ySize": str(entry["dst_h"])
         })
 
-    # 7. Save VRT
+    # 6. Save VRT
     tree = ET.ElementTree(new_root)
     ET.indent(tree, space="  ", level=0)
     tree.write(new_vrt_path, encoding="UTF-8", xml_declaration=False)
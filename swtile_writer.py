@@ -14,21 +14,50 @@ Options:
     --test-region R C   Start test region at row R, col C
     --level ID          Level ID to assign (default: 0)
     --data-type         raster|terrain (default: raster)
+    --write-threads N   Copy tiles with N threads (default: 1)
     --verbose           Show detailed progress
 """
 
 import argparse
 import struct
 import sys
+import errno
 import os
 import re
 import math
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional, BinaryIO, Iterator, Tuple, List, Dict
+from typing import Optional, BinaryIO, Iterator, Tuple, List
 from xml.etree import ElementTree as ET
 from enum import IntEnum
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    from lxml.etree import iterparse as _iterparse
+except ImportError:
+    _iterparse = ET.iterparse
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# os.sendfile can write to regular files only on Linux
+HAS_SENDFILE = sys.platform.startswith('linux') and hasattr(os, 'sendfile')
+HAS_FADVISE = hasattr(os, 'posix_fadvise')
+HAS_WRITEV = hasattr(os, 'writev')
+HAS_PWRITE = hasattr(os, 'pwrite')
+HAS_FALLOCATE = hasattr(os, 'posix_fallocate')
+HAS_COPY_FILE_RANGE = hasattr(os, 'copy_file_range')
+
 
 # ============================================================================
 # Constants
@@ -40,6 +69,18 @@ HEADER_SIZE = 256
 LEVEL_ENTRY_SIZE = 64
 INDEX_ENTRY_SIZE = 8
 
+VALIDATE_THREADS = 32  # Concurrent stat() calls when validating sources
+POOL_BATCH = 4096  # Work items handed to a thread pool at a time
+PREFETCH_DEPTH = 64  # Tiles read ahead by the kernel while writing
+WRITEV_MAX_BUFFERS = 64  # Tiles per os.writev call when not using sendfile
+WRITEV_MAX_BYTES = 1 << 20
+WINDOW_BAND_ROWS = 64  # Window origin rows per pass when searching for a dense region
+
+# Precompiled layouts, so packing does not parse a format string per call
+_HEADER = struct.Struct('<8sHBBIddddHBBQ')  # Leading fields of the header
+_LEVEL_ENTRY = struct.Struct('<BBffHddIIIQQQ')
+_pack_u64_into = struct.Struct('<Q').pack_into  # One index entry
+
 
 class DataType(IntEnum):
     RASTER = 1
@@ -58,19 +99,16 @@ class ImageFormat(IntEnum):
 # Data Structures
 # ============================================================================
 
-@dataclass
-class TileSource:
-    """Represents a single tile from VRT."""
-    filepath: Path
-    x_off: int  # Pixel offset X in mosaic
-    y_off: int  # Pixel offset Y in mosaic
-    row: int = 0  # Computed grid row
-    col: int = 0  # Computed grid col
-
-
 @dataclass 
 class LevelConfig:
-    """Configuration for a single resolution level."""
+    """
+    Configuration for a single resolution level.
+    
+    Tiles are stored as parallel arrays (rows, cols, paths), one entry per
+    tile, plus `slots`: a dense row-major lookup from grid slot to tile
+    number, -1 for empty slots. `sizes` holds source file sizes in bytes
+    once they are known, else None.
+    """
     level_id: int
     resolution_m: float
     tile_extent_m: float
@@ -79,20 +117,111 @@ class LevelConfig:
     grid_cols: int
     grid_rows: int
     tile_size_px: int = 500
-    tiles: Dict[Tuple[int, int], TileSource] = field(default_factory=dict)
+    rows: array = field(default_factory=lambda: array('i'))
+    cols: array = field(default_factory=lambda: array('i'))
+    paths: List[Path] = field(default_factory=list)
+    slots: array = field(default=None, repr=False)
+    sizes: Optional[array] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.slots is None:
+            self.slots = array('i', [-1]) * (self.grid_cols * self.grid_rows)
 
     @property
     def tile_count(self) -> int:
-        return len(self.tiles)
+        return len(self.paths)
+
+    def tile_span(self) -> Tuple[int, int, int, int]:
+        """Return (min_row, min_col, max_row, max_col) over all tiles."""
+        if HAS_NUMPY:
+            rows = np.frombuffer(self.rows, dtype=np.intc)
+            cols = np.frombuffer(self.cols, dtype=np.intc)
+            return int(rows.min()), int(cols.min()), int(rows.max()), int(cols.max())
+        return min(self.rows), min(self.cols), max(self.rows), max(self.cols)
+
+    def tile_at(self, row: int, col: int) -> Optional[int]:
+        """Return the tile number at (row, col), or None if the slot is empty."""
+        if 0 <= row < self.grid_rows and 0 <= col < self.grid_cols:
+            i = self.slots[row * self.grid_cols + col]
+            if i >= 0:
+                return i
+        return None
+
+    def set_tiles(self, rows, cols, paths: List[Path]) -> int:
+        """
+        Replace all tiles. Later entries win when two share a slot, and
+        entries outside the grid are dropped. Returns the number dropped.
+        """
+        self.sizes = None
+        if HAS_NUMPY:
+            return self._set_tiles_numpy(rows, cols, paths)
+        
+        grid_cols, grid_rows = self.grid_cols, self.grid_rows
+        slots = array('i', [-1]) * (grid_cols * grid_rows)
+        dropped = 0
+        for i, (row, col) in enumerate(zip(rows, cols)):
+            if 0 <= row < grid_rows and 0 <= col < grid_cols:
+                slots[row * grid_cols + col] = i
+            else:
+                dropped += 1
+        
+        # Tiles that still own their slot, in slot order
+        keep = [i for i in slots if i >= 0]
+        self.slots = slots
+        self._take(keep, rows, cols, paths)
+        return dropped
+
+    def _set_tiles_numpy(self, rows, cols, paths: List[Path]) -> int:
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        inside = np.flatnonzero(
+            (rows >= 0) & (rows < self.grid_rows) & (cols >= 0) & (cols < self.grid_cols)
+        )
+        
+        # Fancy assignment keeps the last write for repeated slots
+        lut = np.full(self.grid_cols * self.grid_rows, -1, dtype=np.int32)
+        lut[rows[inside] * self.grid_cols + cols[inside]] = inside
+        
+        occupied = np.flatnonzero(lut >= 0)
+        keep = lut[occupied]
+        lut[occupied] = np.arange(len(keep), dtype=np.int32)
+        
+        self.rows = _int_array(rows[keep])
+        self.cols = _int_array(cols[keep])
+        self.paths = [paths[i] for i in keep.tolist()]
+        self.slots = _int_array(lut)
+        return len(rows) - len(inside)
+
+    def subset(self, indices: List[int]):
+        """Keep only the given tile numbers, in the given order."""
+        self.slots = array('i', [-1]) * (self.grid_cols * self.grid_rows)
+        if self.sizes is not None:
+            self.sizes = array('q', [self.sizes[i] for i in indices])
+        self._take(indices, self.rows, self.cols, self.paths)
+
+    def _take(self, indices, rows, cols, paths):
+        self.rows = array('i', [rows[i] for i in indices])
+        self.cols = array('i', [cols[i] for i in indices])
+        self.paths = [paths[i] for i in indices]
+        grid_cols, slots = self.grid_cols, self.slots
+        for n, (row, col) in enumerate(zip(self.rows, self.cols)):
+            slots[row * grid_cols + col] = n
 
     @property
     def index_size(self) -> int:
         return self.grid_cols * self.grid_rows * INDEX_ENTRY_SIZE
 
 
+def _int_array(values) -> array:
+    """Copy a NumPy integer array into a stdlib array('i')."""
+    out = array('i')
+    out.frombytes(np.ascontiguousarray(values, dtype=np.intc).tobytes())
+    return out
+
+
 @dataclass
 class VRTInfo:
-    """Parsed VRT file information."""
+    """Parsed VRT file information. Sources are stored column-wise."""
     filepath: Path
     raster_x_size: int
     raster_y_size: int
@@ -101,7 +230,9 @@ class VRTInfo:
     pixel_size_x: float
     pixel_size_y: float
     crs_epsg: int
-    sources: List[TileSource]
+    filepaths: List[Path]
+    x_offs: array
+    y_offs: array
 
 
 # ============================================================================
@@ -182,13 +313,14 @@ def parse_geotransform(gt_text: str) -> tuple:
     return tuple(values)
 
 
+# Root AUTHORITY of a WKT string, then a bare "EPSG:nnnn" anywhere
+_EPSG_AUTHORITY_RE = re.compile(r'AUTHORITY\["EPSG","(\d+)"\]\]$')
+_EPSG_CODE_RE = re.compile(r'EPSG:(\d+)')
+
+
 def extract_epsg(srs_text: str) -> int:
     """Extract EPSG code from SRS string."""
-    match = re.search(r'AUTHORITY\["EPSG","(\d+)"\]\]$', srs_text)
-    if match:
-        return int(match.group(1))
-    
-    match = re.search(r'EPSG:(\d+)', srs_text)
+    match = _EPSG_AUTHORITY_RE.search(srs_text) or _EPSG_CODE_RE.search(srs_text)
     if match:
         return int(match.group(1))
     
@@ -198,28 +330,84 @@ def extract_epsg(srs_text: str) -> int:
     raise ValueError(f"Could not extract EPSG code from SRS: {srs_text[:100]}...")
 
 
+def _parse_offset(text: str) -> int:
+    """Parse a DstRect offset, which GDAL usually writes as an integer."""
+    try:
+        return int(text)
+    except ValueError:
+        return int(float(text))
+
+
 def parse_vrt(vrt_path: Path, progress: ProgressReporter) -> VRTInfo:
-    """Parse VRT file and extract tile information."""
+    """
+    Parse VRT file and extract tile information.
+    
+    The file is streamed with iterparse (lxml when installed) and each
+    SimpleSource is dropped from the tree once read, so memory stays flat
+    regardless of the number of sources.
+    """
     
     progress.info(f"Parsing: {vrt_path}")
     
-    tree = ET.parse(vrt_path)
-    root = tree.getroot()
+    root = None
+    srs_text = None
+    gt_text = None
+    filepaths = []
+    x_offs = array('i')
+    y_offs = array('i')
+    vrt_dir = vrt_path.parent
     
-    raster_x_size = int(root.attrib['rasterXSize'])
-    raster_y_size = int(root.attrib['rasterYSize'])
+    # Open elements; the parent of a closing element is stack[-1] after pop
+    stack = []
+    
+    for event, elem in _iterparse(str(vrt_path), events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            stack.append(elem)
+            continue
+        
+        stack.pop()
+        tag = elem.tag
+        
+        if tag == 'SimpleSource':
+            filename_elem = elem.find('SourceFilename')
+            dst_rect_elem = elem.find('DstRect')
+            
+            if filename_elem is not None and dst_rect_elem is not None:
+                rel_path = filename_elem.text
+                is_relative = filename_elem.get('relativeToVRT', '0') == '1'
+                
+                if is_relative:
+                    filepath = vrt_dir / rel_path
+                else:
+                    filepath = Path(rel_path)
+                    
+                filepaths.append(filepath)
+                x_offs.append(_parse_offset(dst_rect_elem.get('xOff')))
+                y_offs.append(_parse_offset(dst_rect_elem.get('yOff')))
+            
+            elem.clear()
+            stack[-1].remove(elem)
+        elif len(stack) == 1:
+            # Direct children of the root
+            if tag == 'SRS':
+                srs_text = elem.text
+            elif tag == 'GeoTransform':
+                gt_text = elem.text
+    
+    raster_x_size = int(root.get('rasterXSize'))
+    raster_y_size = int(root.get('rasterYSize'))
     progress.detail(f"Raster size: {raster_x_size:,} × {raster_y_size:,} pixels")
     
-    srs_elem = root.find('SRS')
-    if srs_elem is None:
+    if srs_text is None:
         raise ValueError("VRT missing SRS element")
-    crs_epsg = extract_epsg(srs_elem.text)
+    crs_epsg = extract_epsg(srs_text)
     progress.detail(f"CRS: EPSG:{crs_epsg}")
     
-    gt_elem = root.find('GeoTransform')
-    if gt_elem is None:
+    if gt_text is None:
         raise ValueError("VRT missing GeoTransform element")
-    gt = parse_geotransform(gt_elem.text)
+    gt = parse_geotransform(gt_text)
     
     origin_e = gt[0]
     pixel_size_x = gt[1]
@@ -229,37 +417,7 @@ def parse_vrt(vrt_path: Path, progress: ProgressReporter) -> VRTInfo:
     progress.detail(f"Origin: ({origin_e:,.1f}, {origin_n:,.1f})")
     progress.detail(f"Pixel size: ({pixel_size_x}, {pixel_size_y})")
     
-    sources = []
-    vrt_dir = vrt_path.parent
-    
-    all_sources = root.findall('.//SimpleSource')
-    progress.detail(f"Found {len(all_sources):,} source entries")
-    
-    for source in all_sources:
-        filename_elem = source.find('SourceFilename')
-        dst_rect_elem = source.find('DstRect')
-        
-        if filename_elem is None or dst_rect_elem is None:
-            continue
-            
-        rel_path = filename_elem.text
-        is_relative = filename_elem.attrib.get('relativeToVRT', '0') == '1'
-        
-        if is_relative:
-            filepath = vrt_dir / rel_path
-        else:
-            filepath = Path(rel_path)
-            
-        x_off = int(float(dst_rect_elem.attrib['xOff']))
-        y_off = int(float(dst_rect_elem.attrib['yOff']))
-        
-        sources.append(TileSource(
-            filepath=filepath,
-            x_off=x_off,
-            y_off=y_off
-        ))
-    
-    progress.success(f"Parsed {len(sources):,} tile sources")
+    progress.success(f"Parsed {len(filepaths):,} tile sources")
     
     return VRTInfo(
         filepath=vrt_path,
@@ -270,7 +428,9 @@ def parse_vrt(vrt_path: Path, progress: ProgressReporter) -> VRTInfo:
         pixel_size_x=pixel_size_x,
         pixel_size_y=pixel_size_y,
         crs_epsg=crs_epsg,
-        sources=sources
+        filepaths=filepaths,
+        x_offs=x_offs,
+        y_offs=y_offs
     )
 
 
@@ -314,12 +474,15 @@ def build_level_from_vrt(
     )
     
     # Assign row/col to each tile
-    for source in vrt_info.sources:
-        col = source.x_off // tile_size_px
-        row = source.y_off // tile_size_px
-        source.row = row
-        source.col = col
-        level.tiles[(row, col)] = source
+    if HAS_NUMPY:
+        rows = np.floor_divide(np.asarray(vrt_info.y_offs), tile_size_px)
+        cols = np.floor_divide(np.asarray(vrt_info.x_offs), tile_size_px)
+    else:
+        rows = [y // tile_size_px for y in vrt_info.y_offs]
+        cols = [x // tile_size_px for x in vrt_info.x_offs]
+    dropped = level.set_tiles(rows, cols, vrt_info.filepaths)
+    if dropped:
+        progress.warning(f"Ignoring {dropped:,} sources outside the raster grid")
     
     progress.stats("Resolution", f"{resolution_m} m/px")
     progress.stats("Tile extent", f"{tile_extent_m} m")
@@ -336,6 +499,144 @@ def build_level_from_vrt(
 # Contiguous Tile Selection
 # ============================================================================
 
+def _densest_window_python(
+    level: LevelConfig,
+    min_row: int, min_col: int, max_row: int, max_col: int,
+    height: int, width: int,
+    target_count: int
+) -> Tuple[int, int, int]:
+    """
+    Scan window origins in row-major order. Returns (row, col, count) of the
+    first window holding target_count tiles, or else the first densest one.
+    """
+    best = (min_row, min_col, 0)
+    
+    # One byte per cell of the tile span, 1 where a tile exists, plus the
+    # tiles per span row. Per-column sums over the current band of rows are
+    # slid down one row at a time, and each window count is slid along the
+    # band with one add and one subtract, so no window is recounted.
+    stride = max_col - min_col + 1
+    bitmap = bytearray(stride * (max_row - min_row + 1))
+    row_counts = [0] * (max_row - min_row + 1)
+    for r, c in zip(level.rows, level.cols):
+        r -= min_row
+        bitmap[r * stride + c - min_col] = 1
+        row_counts[r] += 1
+    
+    col_sums = [0] * stride
+    for base in range(0, height * stride, stride):
+        col_sums = [s + b for s, b in zip(col_sums, bitmap[base:base + stride])]
+    band_bound = sum(row_counts[:height])
+    n_cols = stride - width + 1
+    
+    for k, start_row in enumerate(range(min_row, max_row - height + 2)):
+        if k:
+            out_base = (k - 1) * stride
+            in_base = (k + height - 1) * stride
+            col_sums = [s - o + i for s, o, i in zip(
+                col_sums,
+                bitmap[out_base:out_base + stride],
+                bitmap[in_base:in_base + stride])]
+            band_bound += row_counts[k + height - 1] - row_counts[k - 1]
+        
+        # A window holds at most the tiles of the rows it covers
+        if band_bound <= best[2]:
+            continue
+        
+        count = sum(col_sums[:width])
+        for j in range(n_cols):
+            if j:
+                count += col_sums[j + width - 1] - col_sums[j - 1]
+            if count > best[2]:
+                best = (start_row, min_col + j, count)
+                
+                # Early exit if we found enough
+                if count >= target_count:
+                    return best
+    
+    return best
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _scan_window_rows(sat, height, width, target_count, first_hit, row_best, row_best_col):
+        """Per origin row: first column reaching target_count, else the first max."""
+        n_cols = sat.shape[1] - width
+        for r in prange(sat.shape[0] - height):
+            hit = -1
+            best = -1
+            best_c = 0
+            for c in range(n_cols):
+                count = (sat[r + height, c + width] - sat[r, c + width]
+                         - sat[r + height, c] + sat[r, c])
+                if count >= target_count:
+                    hit = c
+                    break
+                if count > best:
+                    best = count
+                    best_c = c
+            first_hit[r] = hit
+            row_best[r] = best
+            row_best_col[r] = best_c
+
+
+def _densest_window_numpy(
+    level: LevelConfig,
+    min_row: int, min_col: int, max_row: int, max_col: int,
+    height: int, width: int,
+    target_count: int
+) -> Tuple[int, int, int]:
+    """Same search as _densest_window_python, via a summed-area table."""
+    sat = np.zeros((max_row - min_row + 2, max_col - min_col + 2), dtype=np.int32)
+    rows = np.frombuffer(level.rows, dtype=np.intc) - min_row
+    cols = np.frombuffer(level.cols, dtype=np.intc) - min_col
+    sat[rows + 1, cols + 1] = 1
+    np.cumsum(sat, axis=0, out=sat)
+    np.cumsum(sat, axis=1, out=sat)
+    
+    if HAS_NUMBA:
+        n_rows = sat.shape[0] - height
+        first_hit = np.empty(n_rows, dtype=np.int64)
+        row_best = np.empty(n_rows, dtype=np.int64)
+        row_best_col = np.empty(n_rows, dtype=np.int64)
+        _scan_window_rows(sat, height, width, target_count, first_hit, row_best, row_best_col)
+        
+        hit_rows = np.flatnonzero(first_hit >= 0)
+        if hit_rows.size:
+            r = int(hit_rows[0])
+            c = int(first_hit[r])
+        else:
+            r = int(row_best.argmax())
+            c = int(row_best_col[r])
+        count = sat[r + height, c + width] - sat[r, c + width] - sat[r + height, c] + sat[r, c]
+        return min_row + r, min_col + c, int(count)
+    
+    # Origins are processed in bands of rows, so the table slab and counts
+    # for a band stay cache-sized and the scan stops at the first band
+    # with a hit. Bands span the full width to keep row-major order.
+    n_rows = sat.shape[0] - height
+    best = (0, 0, -1)
+    for r0 in range(0, n_rows, WINDOW_BAND_ROWS):
+        r1 = min(r0 + WINDOW_BAND_ROWS, n_rows)
+        top = sat[r0:r1]
+        bottom = sat[r0 + height:r1 + height]
+        
+        # Tile count of the window at every origin, four lookups each
+        counts = (bottom[:, width:] - top[:, width:]
+                  - bottom[:, :-width] + top[:, :-width])
+        
+        hits = np.flatnonzero(counts >= target_count)
+        i = int(hits[0]) if hits.size else int(counts.argmax())
+        r, c = divmod(i, counts.shape[1])
+        count = int(counts[r, c])
+        if hits.size:
+            return min_row + r0 + r, min_col + c, count
+        if count > best[2]:
+            best = (r0 + r, c, count)
+    
+    return min_row + best[0], min_col + best[1], best[2]
+
+
 def find_dense_region(
     level: LevelConfig,
     target_count: int,
@@ -351,47 +652,27 @@ def find_dense_region(
     
     progress.info(f"Searching for dense {side}×{side} region...")
     
-    # Get all tile positions
-    all_positions = set(level.tiles.keys())
-    
-    if not all_positions:
+    if not level.tile_count:
         raise ValueError("No tiles in level")
     
     # Find bounds of existing tiles
-    min_row = min(p[0] for p in all_positions)
-    max_row = max(p[0] for p in all_positions)
-    min_col = min(p[1] for p in all_positions)
-    max_col = max(p[1] for p in all_positions)
+    min_row, min_col, max_row, max_col = level.tile_span()
     
     progress.detail(f"Tiles span rows {min_row}-{max_row}, cols {min_col}-{max_col}")
     
-    best_region = None
-    best_count = 0
-    
-    # Slide window to find densest region
-    for start_row in range(min_row, max_row - side + 2):
-        for start_col in range(min_col, max_col - side + 2):
-            count = 0
-            for r in range(start_row, min(start_row + side, max_row + 1)):
-                for c in range(start_col, min(start_col + side, max_col + 1)):
-                    if (r, c) in all_positions:
-                        count += 1
-            
-            if count > best_count:
-                best_count = count
-                best_region = (
-                    start_row, 
-                    start_col, 
-                    min(start_row + side - 1, max_row),
-                    min(start_col + side - 1, max_col)
-                )
-                
-                # Early exit if we found enough
-                if best_count >= target_count:
-                    break
-        
-        if best_count >= target_count:
-            break
+    # Windows stay inside the tile span, so shrink them if the span is smaller
+    height = min(side, max_row - min_row + 1)
+    width = min(side, max_col - min_col + 1)
+    
+    # Slide window to find densest region. With NumPy the window counts
+    # come from a summed-area table, scanned in parallel by numba when it
+    # is installed. The writer ships as a single stdlib script, so the
+    # pure-Python fallback has no compiled extension of its own.
+    search = _densest_window_numpy if HAS_NUMPY else _densest_window_python
+    start_row, start_col, best_count = search(
+        level, min_row, min_col, max_row, max_col, height, width, target_count
+    )
+    best_region = (start_row, start_col, start_row + height - 1, start_col + width - 1)
     
     progress.success(f"Found region with {best_count} tiles at "
                      f"rows {best_region[0]}-{best_region[2]}, "
@@ -406,16 +687,14 @@ def select_contiguous_tiles(
     start_row: Optional[int],
     start_col: Optional[int],
     progress: ProgressReporter
-) -> Dict[Tuple[int, int], TileSource]:
+) -> List[int]:
     """
-    Select a contiguous block of tiles.
+    Select a contiguous block of tiles, returned as tile numbers.
     
     If start_row/start_col specified, start from there.
     Otherwise, find the densest region.
     """
     
-    all_positions = set(level.tiles.keys())
-    
     if start_row is not None and start_col is not None:
         # User specified start position
         progress.info(f"Starting from specified position: row={start_row}, col={start_col}")
@@ -430,11 +709,12 @@ def select_contiguous_tiles(
     min_row, min_col, max_row, max_col = region
     
     # Collect tiles in region
-    selected = {}
+    selected = []
     for row in range(min_row, max_row + 1):
         for col in range(min_col, max_col + 1):
-            if (row, col) in level.tiles:
-                selected[(row, col)] = level.tiles[(row, col)]
+            i = level.tile_at(row, col)
+            if i is not None:
+                selected.append(i)
                 
                 if len(selected) >= target_count:
                     break
@@ -443,20 +723,22 @@ def select_contiguous_tiles(
     
     # Report selected region
     if selected:
-        sel_rows = [p[0] for p in selected.keys()]
-        sel_cols = [p[1] for p in selected.keys()]
+        sel_rows = [level.rows[i] for i in selected]
+        sel_cols = [level.cols[i] for i in selected]
+        sel_min_row, sel_max_row = min(sel_rows), max(sel_rows)
+        sel_min_col, sel_max_col = min(sel_cols), max(sel_cols)
         
         progress.info(f"Selected {len(selected)} contiguous tiles:")
-        progress.stats("Row range", f"{min(sel_rows)} → {max(sel_rows)}")
-        progress.stats("Col range", f"{min(sel_cols)} → {max(sel_cols)}")
-        progress.stats("Grid extent", f"{max(sel_cols)-min(sel_cols)+1} × {max(sel_rows)-min(sel_rows)+1}")
+        progress.stats("Row range", f"{sel_min_row} → {sel_max_row}")
+        progress.stats("Col range", f"{sel_min_col} → {sel_max_col}")
+        progress.stats("Grid extent", f"{sel_max_col-sel_min_col+1} × {sel_max_row-sel_min_row+1}")
         
         # Calculate coordinate bounds
         tile_extent = level.tile_extent_m
-        bounds_min_e = level.origin_e + min(sel_cols) * tile_extent
-        bounds_max_e = level.origin_e + (max(sel_cols) + 1) * tile_extent
-        bounds_max_n = level.origin_n - min(sel_rows) * tile_extent
-        bounds_min_n = level.origin_n - (max(sel_rows) + 1) * tile_extent
+        bounds_min_e = level.origin_e + sel_min_col * tile_extent
+        bounds_max_e = level.origin_e + (sel_max_col + 1) * tile_extent
+        bounds_max_n = level.origin_n - sel_min_row * tile_extent
+        bounds_min_n = level.origin_n - (sel_max_row + 1) * tile_extent
         
         progress.stats("Bounds E", f"{bounds_min_e:,.0f} → {bounds_max_e:,.0f}")
         progress.stats("Bounds N", f"{bounds_min_n:,.0f} → {bounds_max_n:,.0f}")
@@ -468,33 +750,85 @@ def select_contiguous_tiles(
 # Validation
 # ============================================================================
 
+def map_batched(pool: ThreadPoolExecutor, fn, items: list, batch: int = POOL_BATCH) -> Iterator:
+    """pool.map over `items` in order, submitting at most `batch` at a time."""
+    for start in range(0, len(items), batch):
+        yield from pool.map(fn, items[start:start + batch])
+
+
+def _file_size(filepath: Path) -> Optional[int]:
+    """Size of a file, or None if it is missing or cannot be stat'ed."""
+    try:
+        return os.stat(filepath).st_size
+    except OSError:
+        return None
+
+
+def _directory_sizes(job: Tuple[Path, List[Tuple[int, str]]]) -> List[Tuple[int, Optional[int]]]:
+    """
+    Sizes for the given files of one directory, from a single scandir
+    listing. Names absent from the listing cost no stat call at all.
+    """
+    parent, members = job
+    try:
+        with os.scandir(parent) as it:
+            entries = {e.name: e for e in it}
+    except OSError:
+        return [(i, None) for i, _ in members]
+    
+    sizes = []
+    for i, name in members:
+        entry = entries.get(name)
+        size = None
+        if entry is not None:
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                pass
+        sizes.append((i, size))
+    return sizes
+
+
 def validate_sources(
-    tiles: Dict[Tuple[int, int], TileSource],
+    level: LevelConfig,
     progress: ProgressReporter
-) -> Tuple[List[TileSource], List[Path]]:
-    """Validate that source files exist and are readable."""
+) -> Tuple[List[int], List[Path]]:
+    """
+    Validate that source files exist and are readable, and record their
+    sizes on the level (-1 for missing files).
+    Returns (tile numbers of readable tiles, missing paths).
+    """
     
-    tile_list = list(tiles.values())
-    progress.info(f"Validating {len(tile_list):,} source files...")
+    paths = level.paths
+    progress.info(f"Validating {len(paths):,} source files...")
     
     missing = []
     readable = []
     total_size = 0
     
-    bar = progress.progress_bar(len(tile_list), "Checking files")
-    
-    for tile in tile_list:
-        bar.update()
-        
-        if not tile.filepath.exists():
-            missing.append(tile.filepath)
+    bar = progress.progress_bar(len(paths), "Checking files")
+    
+    # Tiles share a few directories, so list each directory once and look
+    # files up by name. Directories are scanned on threads, since scandir
+    # and stat release the GIL.
+    by_dir = {}
+    for i, filepath in enumerate(paths):
+        by_dir.setdefault(filepath.parent, []).append((i, filepath.name))
+    
+    sizes = [None] * len(paths)
+    with ThreadPoolExecutor(max_workers=VALIDATE_THREADS) as pool:
+        for dir_sizes in map_batched(pool, _directory_sizes, list(by_dir.items())):
+            bar.update(len(dir_sizes))
+            for i, size in dir_sizes:
+                sizes[i] = size
+    
+    for i, size in enumerate(sizes):
+        if size is None:
+            missing.append(paths[i])
         else:
-            try:
-                size = tile.filepath.stat().st_size
-                total_size += size
-                readable.append(tile)
-            except OSError:
-                missing.append(tile.filepath)
+            total_size += size
+            readable.append(i)
+    level.sizes = array('q', [-1 if size is None else size for size in sizes])
                 
     bar.finish()
     
@@ -516,14 +850,104 @@ def validate_sources(
 # Binary Writing Helpers
 # ============================================================================
 
-def pack_uint40(value: int) -> bytes:
-    """Pack integer as 5-byte little-endian."""
-    return (value & 0xFFFFFFFFFF).to_bytes(5, 'little')
+def prefetch_file(filepath: Path):
+    """Ask the kernel to start reading a file in the background."""
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
+def send_tile_data(out_fd: int, filepath: Path) -> int:
+    """
+    Append a tile file at the current position of `out_fd` with
+    os.sendfile, so the bytes are copied in-kernel. Returns its size.
+    """
+    with open(filepath, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        in_fd = src.fileno()
+        sent = 0
+        while sent < size:
+            n = os.sendfile(out_fd, in_fd, sent, size - sent)
+            if n == 0:
+                raise OSError(f"File shrank while copying: {filepath}")
+            sent += n
+    return size
+
+
+def copy_tile_data_at(out_fd: int, filepath: Path, dst_offset: int, size: int):
+    """
+    Copy a tile file of known size to `dst_offset` in `out_fd` without
+    touching the file position, so several threads can copy at once.
+    Uses os.copy_file_range (in-kernel) where supported, else pread/pwrite.
+    """
+    global HAS_COPY_FILE_RANGE
+    with open(filepath, 'rb') as src:
+        in_fd = src.fileno()
+        if os.fstat(in_fd).st_size != size:
+            raise OSError(f"File changed size since it was measured: {filepath}")
+        
+        copied = 0
+        if HAS_COPY_FILE_RANGE:
+            try:
+                while copied < size:
+                    n = os.copy_file_range(in_fd, out_fd, size - copied, copied, dst_offset + copied)
+                    if n == 0:
+                        raise OSError(f"File shrank while copying: {filepath}")
+                    copied += n
+                return
+            except OSError as e:
+                if copied or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL):
+                    raise
+                # Not supported for this pair of filesystems; stop trying
+                HAS_COPY_FILE_RANGE = False
+        
+        data = memoryview(src.read())
+    if len(data) != size:
+        raise OSError(f"File changed size while copying: {filepath}")
+    while copied < size:
+        copied += os.pwrite(out_fd, data[copied:], dst_offset + copied)
 
-def pack_uint24(value: int) -> bytes:
-    """Pack integer as 3-byte little-endian."""
-    return (value & 0xFFFFFF).to_bytes(3, 'little')
+
+class VectorWriter:
+    """
+    Collects tile buffers and writes each batch with a single os.writev
+    call. Used when tiles are read into memory rather than sent in-kernel.
+    """
+    
+    def __init__(self, f: BinaryIO):
+        f.flush()
+        self.f = f
+        self.fd = f.fileno()
+        self.buffers = []
+        self.size = 0
+        
+    def write(self, data: bytes):
+        if not HAS_WRITEV:
+            self.f.write(data)
+            return
+        self.buffers.append(data)
+        self.size += len(data)
+        if len(self.buffers) >= WRITEV_MAX_BUFFERS or self.size >= WRITEV_MAX_BYTES:
+            self.flush()
+    
+    def flush(self):
+        if self.buffers:
+            written = os.writev(self.fd, self.buffers)
+            if written < self.size:
+                # Short write: finish the remainder
+                rest = memoryview(b''.join(self.buffers))[written:]
+                while rest:
+                    rest = rest[os.write(self.fd, rest):]
+            self.buffers = []
+            self.size = 0
+        self.f.flush()
 
 
 def write_header(
@@ -539,22 +963,13 @@ def write_header(
     """Write file header."""
     header = bytearray(HEADER_SIZE)
     
-    header[0:8] = MAGIC
-    struct.pack_into('<H', header, 8, VERSION)
-    header[10] = data_type
-    header[11] = image_format
-    struct.pack_into('<I', header, 12, crs_epsg)
-    
     min_e, min_n, max_e, max_n = bounds
-    struct.pack_into('<d', header, 16, min_e)
-    struct.pack_into('<d', header, 24, min_n)
-    struct.pack_into('<d', header, 32, max_e)
-    struct.pack_into('<d', header, 40, max_n)
-    
-    struct.pack_into('<H', header, 48, tile_size_px)
-    header[50] = num_levels
-    header[51] = 0
-    struct.pack_into('<Q', header, 52, level_table_offset)
+    _HEADER.pack_into(
+        header, 0,
+        MAGIC, VERSION, data_type, image_format, crs_epsg,
+        min_e, min_n, max_e, max_n,
+        tile_size_px, num_levels, 0, level_table_offset
+    )
     
     f.write(header)
 
@@ -567,21 +982,13 @@ def write_level_entry(
     data_offset: int
 ):
     """Write level table entry."""
-    entry = bytearray(LEVEL_ENTRY_SIZE)
-    
-    entry[0] = level.level_id
-    entry[1] = 0
-    struct.pack_into('<f', entry, 2, level.resolution_m)
-    struct.pack_into('<f', entry, 6, level.tile_extent_m)
-    struct.pack_into('<H', entry, 10, 0)
-    struct.pack_into('<d', entry, 12, level.origin_e)
-    struct.pack_into('<d', entry, 20, level.origin_n)
-    struct.pack_into('<I', entry, 28, level.grid_cols)
-    struct.pack_into('<I', entry, 32, level.grid_rows)
-    struct.pack_into('<I', entry, 36, level.tile_count)
-    struct.pack_into('<Q', entry, 40, index_offset)
-    struct.pack_into('<Q', entry, 48, index_length)
-    struct.pack_into('<Q', entry, 56, data_offset)
+    entry = _LEVEL_ENTRY.pack(
+        level.level_id, 0,
+        level.resolution_m, level.tile_extent_m, 0,
+        level.origin_e, level.origin_n,
+        level.grid_cols, level.grid_rows, level.tile_count,
+        index_offset, index_length, data_offset
+    )
     
     f.write(entry)
 
@@ -603,14 +1010,160 @@ def detect_image_format(filepath: Path) -> ImageFormat:
     return mapping.get(ext, ImageFormat.PNG)
 
 
+def write_level_data(
+    f: BinaryIO,
+    level: LevelConfig,
+    tiles_to_write: List[int],
+    data_offset: int,
+    index: bytearray,
+    progress: ProgressReporter
+) -> int:
+    """
+    Stream tiles in order from the current position of `f`, filling in
+    `index`. Unreadable tiles are skipped. Returns the data length.
+    """
+    rows = level.rows
+    cols = level.cols
+    paths = level.paths
+    current_data_offset = 0
+    
+    bar = progress.progress_bar(len(tiles_to_write), "Writing tiles")
+    
+    # Keep PREFETCH_DEPTH reads in flight ahead of the copy, so the
+    # disk sees a deep queue instead of one small file at a time
+    prefetch = tiles_to_write[:PREFETCH_DEPTH] if HAS_FADVISE else []
+    for i in prefetch:
+        prefetch_file(paths[i])
+    
+    out_fd = f.fileno()
+    writer = None if HAS_SENDFILE else VectorWriter(f)
+    
+    # Names used per tile, bound to locals ahead of the loop
+    update = bar.update
+    pack_into = _pack_u64_into
+    send = send_tile_data
+    write = writer.write if writer is not None else None
+    grid_cols = level.grid_cols
+    entry_size = INDEX_ENTRY_SIZE
+    prefetch_limit = len(tiles_to_write) - PREFETCH_DEPTH if prefetch else 0
+    
+    for n, i in enumerate(tiles_to_write):
+        update()
+        
+        if n < prefetch_limit:
+            prefetch_file(paths[tiles_to_write[n + PREFETCH_DEPTH]])
+        
+        try:
+            if write is None:
+                tile_size = send(out_fd, paths[i])
+            else:
+                tile_data = paths[i].read_bytes()
+                tile_size = len(tile_data)
+        except OSError as e:
+            progress.error(f"Failed to read {paths[i]}: {e}")
+            if write is None:
+                # Drop anything a partial copy left behind
+                os.lseek(out_fd, data_offset + current_data_offset, os.SEEK_SET)
+            continue
+        
+        if write is not None:
+            write(tile_data)
+        
+        # 5-byte offset and 3-byte length as one little-endian u64
+        pack_into(index, (rows[i] * grid_cols + cols[i]) * entry_size,
+                  (current_data_offset & 0xFFFFFFFFFF) | ((tile_size & 0xFFFFFF) << 40))
+        
+        current_data_offset += tile_size
+    
+    if writer is not None:
+        writer.flush()
+    bar.finish()
+    
+    return current_data_offset
+
+
+def write_level_data_parallel(
+    f: BinaryIO,
+    level: LevelConfig,
+    tiles_to_write: List[int],
+    data_offset: int,
+    index: bytearray,
+    threads: int,
+    progress: ProgressReporter
+) -> int:
+    """
+    Lay tiles out in order from their sizes, then copy them with `threads`
+    workers, each writing its own region of the output with positional I/O.
+    A tile that cannot be copied keeps an empty index entry, and its region
+    is left as zeros. Returns the data length.
+    """
+    rows = level.rows
+    cols = level.cols
+    paths = level.paths
+    grid_cols = level.grid_cols
+    out_fd = f.fileno()
+    f.flush()
+    
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        if level.sizes is not None:
+            # Known from validation, so no file is stat()ed twice
+            sizes = [level.sizes[i] for i in tiles_to_write]
+        else:
+            sizes = list(map_batched(pool, _file_size, [paths[i] for i in tiles_to_write]))
+        
+        # Offsets follow from the sizes, so the index is complete up front
+        jobs = []
+        current_data_offset = 0
+        for i, size in zip(tiles_to_write, sizes):
+            if size is None or size < 0:
+                progress.error(f"Failed to read {paths[i]}: file not found")
+                continue
+            entry_offset = (rows[i] * grid_cols + cols[i]) * INDEX_ENTRY_SIZE
+            _pack_u64_into(index, entry_offset,
+                           (current_data_offset & 0xFFFFFFFFFF) | ((size & 0xFFFFFF) << 40))
+            jobs.append((paths[i], data_offset + current_data_offset, size, entry_offset))
+            current_data_offset += size
+        
+        if HAS_FALLOCATE and current_data_offset:
+            try:
+                os.posix_fallocate(out_fd, data_offset, current_data_offset)
+            except OSError:
+                pass
+        
+        def copy(job):
+            filepath, dst_offset, size, entry_offset = job
+            try:
+                copy_tile_data_at(out_fd, filepath, dst_offset, size)
+            except OSError as e:
+                return entry_offset, f"Failed to read {filepath}: {e}"
+            return entry_offset, None
+        
+        bar = progress.progress_bar(len(tiles_to_write), "Writing tiles")
+        bar.update(len(tiles_to_write) - len(jobs))
+        for entry_offset, error in map_batched(pool, copy, jobs):
+            bar.update()
+            if error:
+                progress.error(error)
+                _pack_u64_into(index, entry_offset, 0)
+        bar.finish()
+    
+    return current_data_offset
+
+
 def write_swtiles(
     output_path: Path,
     levels: List[LevelConfig],
     crs_epsg: int,
     data_type: DataType,
-    progress: ProgressReporter
+    progress: ProgressReporter,
+    write_threads: int = 1
 ):
-    """Write complete SWTILES file."""
+    """
+    Write complete SWTILES file.
+    
+    With write_threads > 1, tile data is copied by that many threads into a
+    precomputed layout instead of being streamed in order.
+    """
     
     progress.phase("Writing SWTILES")
     
@@ -618,21 +1171,19 @@ def write_swtiles(
     levels = sorted(levels, key=lambda l: -l.resolution_m)
     
     # Detect image format from first tile
-    first_tile = next(iter(levels[0].tiles.values()))
-    image_format = detect_image_format(first_tile.filepath)
+    image_format = detect_image_format(levels[0].paths[0])
     progress.info(f"Image format: {image_format.name}")
     
     # Calculate overall bounds from actual tiles
     all_bounds = []
     for level in levels:
-        if level.tiles:
-            rows = [p[0] for p in level.tiles.keys()]
-            cols = [p[1] for p in level.tiles.keys()]
+        if level.tile_count:
+            min_row, min_col, max_row, max_col = level.tile_span()
             
-            min_e = level.origin_e + min(cols) * level.tile_extent_m
-            max_e = level.origin_e + (max(cols) + 1) * level.tile_extent_m
-            max_n = level.origin_n - min(rows) * level.tile_extent_m
-            min_n = level.origin_n - (max(rows) + 1) * level.tile_extent_m
+            min_e = level.origin_e + min_col * level.tile_extent_m
+            max_e = level.origin_e + (max_col + 1) * level.tile_extent_m
+            max_n = level.origin_n - min_row * level.tile_extent_m
+            min_n = level.origin_n - (max_row + 1) * level.tile_extent_m
             
             all_bounds.append((min_e, min_n, max_e, max_n))
     
@@ -683,39 +1234,32 @@ def write_swtiles(
             index_offset = offsets['index_offset']
             data_offset = offsets['data_offset']
             
-            tiles_to_write = list(level.tiles.items())
+            rows = level.rows
+            cols = level.cols
             
-            # Sort tiles by row, then col for sequential disk access
-            tiles_to_write.sort(key=lambda x: (x[0][0], x[0][1]))
+            # Sort tiles by row, then col for sequential disk access.
+            # The slot number row * grid_cols + col is a single-int sort key.
+            grid_cols = level.grid_cols
+            if HAS_NUMPY:
+                keys = np.frombuffer(rows, dtype=np.intc).astype(np.int64) * grid_cols
+                keys += np.frombuffer(cols, dtype=np.intc)
+                tiles_to_write = np.argsort(keys, kind='stable').tolist()
+            else:
+                tiles_to_write = sorted(range(level.tile_count),
+                                        key=lambda i: rows[i] * grid_cols + cols[i])
             
             # Build index and write data
             index = bytearray(level.index_size)
             
             f.seek(data_offset)
-            current_data_offset = 0
-            
-            bar = progress.progress_bar(len(tiles_to_write), "Writing tiles")
-            
-            for (row, col), tile in tiles_to_write:
-                bar.update()
-                
-                try:
-                    tile_data = tile.filepath.read_bytes()
-                except OSError as e:
-                    progress.error(f"Failed to read {tile.filepath}: {e}")
-                    continue
-                
-                f.write(tile_data)
-                
-                entry_idx = row * level.grid_cols + col
-                entry_offset = entry_idx * INDEX_ENTRY_SIZE
-                
-                index[entry_offset:entry_offset + 5] = pack_uint40(current_data_offset)
-                index[entry_offset + 5:entry_offset + 8] = pack_uint24(len(tile_data))
-                
-                current_data_offset += len(tile_data)
-            
-            bar.finish()
+            if write_threads > 1 and HAS_PWRITE:
+                current_data_offset = write_level_data_parallel(
+                    f, level, tiles_to_write, data_offset, index, write_threads, progress
+                )
+            else:
+                current_data_offset = write_level_data(
+                    f, level, tiles_to_write, data_offset, index, progress
+                )
             
             offsets['data_length'] = current_data_offset
             
@@ -802,6 +1346,9 @@ Examples:
                         help='Data type (default: raster)')
     parser.add_argument('--tile-size', type=int, default=500,
                         help='Tile size in pixels (default: 500)')
+    parser.add_argument('--write-threads', type=int, default=1, metavar='N',
+                        help='Copy tiles with N threads into a precomputed layout; '
+                             'helps on SSD/network storage (default: 1, sequential)')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Show detailed output')
     
@@ -850,11 +1397,11 @@ Examples:
         )
         
         # Replace level tiles with selection
-        level.tiles = selected_tiles
+        level.subset(selected_tiles)
     
     # Validate source files
     progress.phase("Validating Source Files")
-    valid_tiles, missing_tiles = validate_sources(level.tiles, progress)
+    valid_tiles, missing_tiles = validate_sources(level, progress)
     
     if missing_tiles:
         if args.dry_run:
@@ -862,7 +1409,7 @@ Examples:
             sys.exit(1)
         else:
             progress.warning(f"Proceeding with {len(valid_tiles)} valid tiles")
-            level.tiles = {(t.row, t.col): t for t in valid_tiles}
+            level.subset(valid_tiles)
     
     if args.dry_run:
         progress.phase("Dry Run Complete")
@@ -870,7 +1417,7 @@ Examples:
         progress.stats("Ready to write", f"{level.tile_count:,} tiles")
         
         if valid_tiles:
-            total_input = sum(t.filepath.stat().st_size for t in valid_tiles)
+            total_input = sum(level.sizes)
             est_size = total_input + level.index_size + HEADER_SIZE + LEVEL_ENTRY_SIZE
             progress.stats("Estimated output", f"{est_size / 1024 / 1024:.1f} MB")
         
@@ -885,7 +1432,8 @@ Examples:
         levels=[level],
         crs_epsg=vrt_info.crs_epsg,
         data_type=data_type,
-        progress=progress
+        progress=progress,
+        write_threads=args.write_threads
     )
     
     progress.phase("Complete")
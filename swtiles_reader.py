@@ -13,12 +13,21 @@ Usage:
 """
 
 import argparse
+import importlib.util
+import mmap
+import os
 import struct
 import sys
 import io
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional, BinaryIO, Tuple, List, Iterator, Callable, Dict
+from typing import Optional, BinaryIO, Tuple, List, Iterator, Callable, Dict, Sequence
 from enum import IntEnum
 
 
@@ -33,6 +42,23 @@ except ImportError:
     HAS_PIL = False
     print("Warning: PIL not installed. Install with: pip install Pillow")
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _TURBOJPEG = TurboJPEG()  # Raises if libjpeg-turbo itself cannot be loaded
+    HAS_TURBOJPEG = True
+except (ImportError, OSError, RuntimeError):
+    HAS_TURBOJPEG = False
+
+# Numba is only probed for here and imported by _scan_kernel on the first
+# index scan: importing it takes longer than everything else together
+HAS_NUMBA = HAS_NUMPY and importlib.util.find_spec('numba') is not None
+
 
 # ============================================================================
 # Constants (must match writer)
@@ -44,6 +70,22 @@ HEADER_SIZE = 256
 LEVEL_ENTRY_SIZE = 64
 INDEX_ENTRY_SIZE = 8
 
+HAS_PREAD = hasattr(os, 'pread')
+HAS_FADVISE = hasattr(os, 'posix_fadvise')
+MMAP_READ_MAX = 64 * 1024  # Reads up to this size are copied from the mapping, not pread
+
+DECODE_THREADS = os.cpu_count() or 1  # Tiles decoded concurrently (decoders release the GIL)
+DECODE_BATCH = 4 * DECODE_THREADS  # Decoded tiles held in memory at a time
+PROCESS_CHUNK = 4  # Tiles sent to a decode process per task
+TILE_CACHE_SIZE = 64  # Decoded tiles kept by read_tile_as_image
+BOUNDS_CACHE_SIZE = 4096  # Tile bounds kept by rowcol_to_bounds
+COVERAGE_BANDS = 20  # Row bands per coverage map, one progress update each
+
+# Precompiled layouts, so unpacking does not parse a format string per call
+_HEADER = struct.Struct('<8sHBBIddddHBxQ')  # Leading fields of the header
+_LEVEL = struct.Struct('<BxffxxddIIIQQQ')
+_ENTRY = struct.Struct('<Q')  # 5-byte offset and 3-byte length
+
 
 class DataType(IntEnum):
     RASTER = 1
@@ -104,7 +146,141 @@ class CoverageInfo:
     col_range: Optional[Tuple[int, int]]
     bounds: Optional[Tuple[float, float, float, float]]
     grid_extent: Optional[Tuple[int, int]]
-    tile_positions: List[Tuple[int, int]]  # Added: list of (row, col)
+    # Tile rows and columns in row-major order: int32 arrays with NumPy,
+    # lists without. None if positions were not requested.
+    rows: Optional[Sequence[int]]
+    cols: Optional[Sequence[int]]
+    
+    @property
+    def positions(self) -> Iterator[Tuple[int, int]]:
+        """(row, col) of each tile, as Python ints."""
+        if self.rows is None:
+            return iter(())
+        if HAS_NUMPY and isinstance(self.rows, np.ndarray):
+            return zip(self.rows.tolist(), self.cols.tolist())
+        return zip(self.rows, self.cols)
+    
+    @property
+    def tile_positions(self) -> Optional[List[Tuple[int, int]]]:
+        """(row, col) list, None if not requested. Kept for compatibility."""
+        return None if self.rows is None else list(self.positions)
+
+
+def make_coverage(level: 'LevelInfo', non_empty_count: int, total_size: int,
+                  row_range: Optional[Tuple[int, int]],
+                  col_range: Optional[Tuple[int, int]],
+                  rows: Optional[Sequence[int]],
+                  cols: Optional[Sequence[int]]) -> CoverageInfo:
+    """Build CoverageInfo for a level, deriving bounds and extent from the ranges."""
+    if non_empty_count == 0:
+        return CoverageInfo(
+            non_empty_count=0,
+            total_size=0,
+            row_range=None,
+            col_range=None,
+            bounds=None,
+            grid_extent=None,
+            rows=rows,
+            cols=cols
+        )
+    
+    min_row, max_row = row_range
+    min_col, max_col = col_range
+    bounds = (
+        level.origin_e + min_col * level.tile_extent_m,
+        level.origin_n - (max_row + 1) * level.tile_extent_m,
+        level.origin_e + (max_col + 1) * level.tile_extent_m,
+        level.origin_n - min_row * level.tile_extent_m
+    )
+    
+    return CoverageInfo(
+        non_empty_count=non_empty_count,
+        total_size=total_size,
+        row_range=row_range,
+        col_range=col_range,
+        bounds=bounds,
+        grid_extent=(max_col - min_col + 1, max_row - min_row + 1),
+        rows=rows,
+        cols=cols
+    )
+
+
+@lru_cache(maxsize=BOUNDS_CACHE_SIZE)
+def _tile_bounds(row: int, col: int, origin_e: float, origin_n: float,
+                 tile_extent_m: float) -> Tuple[float, float, float, float]:
+    """
+    Bounds of one tile. Keyed on the level's scalar parameters, so the
+    cache is shared by all readers and holds no reference to any of them.
+    """
+    min_e = origin_e + col * tile_extent_m
+    max_e = min_e + tile_extent_m
+    max_n = origin_n - row * tile_extent_m
+    min_n = max_n - tile_extent_m
+    return (min_e, min_n, max_e, max_n)
+
+
+# ============================================================================
+# Index Scan Kernel
+# ============================================================================
+
+_SCAN_KERNEL = None
+
+
+def _scan_kernel() -> Optional[Callable]:
+    """
+    The Numba index scan kernel, compiled (or loaded from Numba's cache)
+    on first use. None if Numba turns out not to import.
+    """
+    global _SCAN_KERNEL, HAS_NUMBA
+    if _SCAN_KERNEL is not None or not HAS_NUMBA:
+        return _SCAN_KERNEL
+    
+    try:
+        from numba import njit, prange
+    except ImportError:
+        HAS_NUMBA = False
+        return None
+    
+    @njit(parallel=True, cache=True)
+    def _scan_entries(entries, grid_cols, n_chunks):
+        """
+        Non-empty (rows, cols, offsets, lengths) of an index, in row-major
+        order. Chunks are counted in parallel, then filled in parallel at
+        their prefix-sum positions, so no temporaries span the whole grid.
+        """
+        n = entries.shape[0]
+        step = (n + n_chunks - 1) // n_chunks
+        shift = np.uint64(40)
+        mask = np.uint64(0xFFFFFFFFFF)
+        
+        starts = np.zeros(n_chunks + 1, dtype=np.int64)
+        for k in prange(n_chunks):
+            count = 0
+            for i in range(k * step, min(n, (k + 1) * step)):
+                if entries[i] >> shift:
+                    count += 1
+            starts[k + 1] = count
+        starts = np.cumsum(starts)
+        
+        total = starts[n_chunks]
+        rows = np.empty(total, dtype=np.int64)
+        cols = np.empty(total, dtype=np.int64)
+        offsets = np.empty(total, dtype=np.uint64)
+        lengths = np.empty(total, dtype=np.uint32)
+        for k in prange(n_chunks):
+            j = starts[k]
+            for i in range(k * step, min(n, (k + 1) * step)):
+                entry = entries[i]
+                if entry >> shift:
+                    rows[j] = i // grid_cols
+                    cols[j] = i % grid_cols
+                    offsets[j] = entry & mask
+                    lengths[j] = entry >> shift
+                    j += 1
+        return rows, cols, offsets, lengths
+    
+    _SCAN_KERNEL = _scan_entries
+    return _SCAN_KERNEL
 
 
 # ============================================================================
@@ -114,12 +290,29 @@ class CoverageInfo:
 class ProgressBar:
     """Simple progress bar for terminal output."""
     
-    def __init__(self, description: str = "", width: int = 50):
+    def __init__(self, description: str = "", width: int = 50,
+                 min_interval: float = 0.1):
         self.description = description
         self.width = width
         self.last_percent = -1
+        
+        # Redraws are throttled to one per ~0.1% of total and per
+        # min_interval seconds; the final update is always drawn.
+        self.min_interval = min_interval
+        self._next_update = 0
+        self._last_time = None
     
     def update(self, current: int, total: int):
+        if current < self._next_update and current != total:
+            return
+        self._next_update = current + max(1, total // 1000)
+        
+        now = time.monotonic()
+        if (current != total and self._last_time is not None
+                and now - self._last_time < self.min_interval):
+            return
+        self._last_time = now
+        
         percent = int(100 * current / total) if total > 0 else 100
         
         if percent != self.last_percent:
@@ -145,21 +338,74 @@ class SwtilesReader:
     def __init__(self, filepath: Path):
         self.filepath = Path(filepath)
         self.file: Optional[BinaryIO] = None
+        self.mm: Optional[mmap.mmap] = None
         self.header: Optional[FileHeader] = None
         self.levels: List[LevelInfo] = []
+        self._levels_by_id: Dict[int, LevelInfo] = {}
+        self._finest: Optional[LevelInfo] = None
+        self._coarsest: Optional[LevelInfo] = None
+        
+        # Per-level parameters as NumPy arrays parallel to self.levels, for
+        # batch coordinate conversion; positions in self.levels by level_id
+        self._level_pos: Dict[int, int] = {}
+        self._lvl_origin_e = self._lvl_origin_n = self._lvl_tile_extent_m = None
+        
+        # Whole level indexes by index offset, read on first use
+        self._index_cache: Dict[int, bytes] = {}
+        
+        # Decoded tiles by (absolute offset, length), least recently used first
+        self._tile_cache: 'OrderedDict[Tuple[int, int], Image.Image]' = OrderedDict()
+        self._tile_cache_lock = threading.Lock()
         
         self._open()
         self._read_header()
         self._read_level_table()
     
     def _open(self):
-        """Open file for reading."""
+        """Open file for reading and map it into memory."""
         if not self.filepath.exists():
             raise FileNotFoundError(f"File not found: {self.filepath}")
         self.file = open(self.filepath, 'rb')
+        
+        # Header, tables, index entries and tiles are all sliced straight
+        # from the mapping, so lookups cost no seek/read syscalls.
+        if os.fstat(self.file.fileno()).st_size < HEADER_SIZE:
+            self.close()
+            raise ValueError("File too small for header")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._advise('MADV_RANDOM', 0, len(self.mm))
+    
+    def _advise(self, option: str, start: int, length: int):
+        """Give the kernel an access-pattern hint for a byte range, where supported."""
+        if not hasattr(self.mm, 'madvise') or not hasattr(mmap, option):
+            return
+        # madvise() needs a page-aligned start
+        aligned = start - start % mmap.PAGESIZE
+        self.mm.madvise(getattr(mmap, option), aligned, length + start - aligned)
+    
+    def _prefetch(self, start: int, length: int):
+        """
+        Have the kernel start reading a byte range into the page cache in
+        the background, where supported. Serves both the mapping and pread.
+        """
+        if HAS_FADVISE and length > 0:
+            try:
+                os.posix_fadvise(self.file.fileno(), start, length, os.POSIX_FADV_WILLNEED)
+            except (AttributeError, OSError):
+                pass
     
     def close(self):
         """Close file."""
+        self.clear_cache()
+        self._index_cache.clear()
+        if self.mm:
+            try:
+                self.mm.close()
+            except BufferError:
+                # Index arrays still view the mapping, e.g. held by a
+                # traceback; it is unmapped once they are freed
+                pass
+            self.mm = None
         if self.file:
             self.file.close()
             self.file = None
@@ -172,71 +418,74 @@ class SwtilesReader:
     
     def _read_header(self):
         """Parse file header."""
-        self.file.seek(0)
-        data = self.file.read(HEADER_SIZE)
+        data = self.mm[0:HEADER_SIZE]
         
         if len(data) < HEADER_SIZE:
             raise ValueError("File too small for header")
         
-        magic = data[0:8]
+        (magic, version, data_type, image_format, crs_epsg,
+         min_e, min_n, max_e, max_n,
+         tile_size_px, num_levels, level_table_offset) = _HEADER.unpack_from(data)
+        
         if magic != MAGIC:
             raise ValueError(f"Invalid magic: {magic}, expected {MAGIC}")
         
-        version = struct.unpack_from('<H', data, 8)[0]
         if version != VERSION:
             raise ValueError(f"Unsupported version: {version}, expected {VERSION}")
         
         self.header = FileHeader(
             magic=magic,
             version=version,
-            data_type=DataType(data[10]),
-            image_format=ImageFormat(data[11]),
-            crs_epsg=struct.unpack_from('<I', data, 12)[0],
-            bounds_min_e=struct.unpack_from('<d', data, 16)[0],
-            bounds_min_n=struct.unpack_from('<d', data, 24)[0],
-            bounds_max_e=struct.unpack_from('<d', data, 32)[0],
-            bounds_max_n=struct.unpack_from('<d', data, 40)[0],
-            tile_size_px=struct.unpack_from('<H', data, 48)[0],
-            num_levels=data[50],
-            level_table_offset=struct.unpack_from('<Q', data, 52)[0]
+            data_type=DataType(data_type),
+            image_format=ImageFormat(image_format),
+            crs_epsg=crs_epsg,
+            bounds_min_e=min_e,
+            bounds_min_n=min_n,
+            bounds_max_e=max_e,
+            bounds_max_n=max_n,
+            tile_size_px=tile_size_px,
+            num_levels=num_levels,
+            level_table_offset=level_table_offset
         )
     
     def _read_level_table(self):
         """Parse level table."""
-        self.file.seek(self.header.level_table_offset)
+        table_offset = self.header.level_table_offset
         
-        for _ in range(self.header.num_levels):
-            data = self.file.read(LEVEL_ENTRY_SIZE)
-            
-            level = LevelInfo(
-                level_id=data[0],
-                resolution_m=struct.unpack_from('<f', data, 2)[0],
-                tile_extent_m=struct.unpack_from('<f', data, 6)[0],
-                origin_e=struct.unpack_from('<d', data, 12)[0],
-                origin_n=struct.unpack_from('<d', data, 20)[0],
-                grid_cols=struct.unpack_from('<I', data, 28)[0],
-                grid_rows=struct.unpack_from('<I', data, 32)[0],
-                tile_count=struct.unpack_from('<I', data, 36)[0],
-                index_offset=struct.unpack_from('<Q', data, 40)[0],
-                index_length=struct.unpack_from('<Q', data, 48)[0],
-                data_offset=struct.unpack_from('<Q', data, 56)[0]
-            )
+        for i in range(self.header.num_levels):
+            level = LevelInfo(*_LEVEL.unpack_from(self.mm, table_offset + i * LEVEL_ENTRY_SIZE))
             self.levels.append(level)
+            self._levels_by_id.setdefault(level.level_id, level)
+            self._level_pos.setdefault(level.level_id, i)
+        
+        if HAS_NUMPY:
+            self._lvl_origin_e = np.array([l.origin_e for l in self.levels], dtype=np.float64)
+            self._lvl_origin_n = np.array([l.origin_n for l in self.levels], dtype=np.float64)
+            self._lvl_tile_extent_m = np.array([l.tile_extent_m for l in self.levels], dtype=np.float64)
+        
+        # Resolved once here, since most calls fall back to the finest level
+        if self.levels:
+            self._finest = min(self.levels, key=lambda l: l.resolution_m)
+            self._coarsest = max(self.levels, key=lambda l: l.resolution_m)
     
     def get_level(self, level_id: int = 0) -> LevelInfo:
         """Get level by ID."""
-        for level in self.levels:
-            if level.level_id == level_id:
-                return level
-        raise ValueError(f"Level {level_id} not found")
+        level = self._levels_by_id.get(level_id)
+        if level is None:
+            raise ValueError(f"Level {level_id} not found")
+        return level
     
     def get_finest_level(self) -> LevelInfo:
         """Get finest resolution level."""
-        return min(self.levels, key=lambda l: l.resolution_m)
+        if self._finest is None:
+            raise ValueError("File has no levels")
+        return self._finest
     
     def get_coarsest_level(self) -> LevelInfo:
         """Get coarsest resolution level."""
-        return max(self.levels, key=lambda l: l.resolution_m)
+        if self._coarsest is None:
+            raise ValueError("File has no levels")
+        return self._coarsest
     
     def coord_to_rowcol(self, easting: float, northing: float,
                         level: LevelInfo) -> Tuple[int, int]:
@@ -245,14 +494,49 @@ class SwtilesReader:
         row = int((level.origin_n - northing) / level.tile_extent_m)
         return row, col
     
+    def coord_to_rowcol_batch(self, eastings, northings,
+                              level: LevelInfo) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Convert arrays of coordinates to (rows, cols) arrays for given level.
+        Truncates like coord_to_rowcol. Requires NumPy.
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("NumPy not installed")
+        
+        i = self._level_pos.get(level.level_id)
+        if i is not None and self.levels[i] is level:
+            origin_e = self._lvl_origin_e[i]
+            origin_n = self._lvl_origin_n[i]
+            extent = self._lvl_tile_extent_m[i]
+        else:
+            origin_e, origin_n, extent = level.origin_e, level.origin_n, level.tile_extent_m
+        
+        eastings = np.asarray(eastings, dtype=np.float64)
+        northings = np.asarray(northings, dtype=np.float64)
+        cols = ((eastings - origin_e) / extent).astype(np.int64)
+        rows = ((origin_n - northings) / extent).astype(np.int64)
+        return rows, cols
+    
     def rowcol_to_bounds(self, row: int, col: int,
                          level: LevelInfo) -> Tuple[float, float, float, float]:
         """Get coordinate bounds for tile at row/col."""
-        min_e = level.origin_e + col * level.tile_extent_m
+        return _tile_bounds(row, col, level.origin_e, level.origin_n, level.tile_extent_m)
+    
+    def rowcol_to_bounds_batch(self, rows, cols, level: LevelInfo
+                               ) -> Tuple['np.ndarray', ...]:
+        """
+        Bounds of tiles given as arrays of rows and cols, as four arrays
+        (min_e, min_n, max_e, max_n). Same arithmetic as rowcol_to_bounds.
+        Requires NumPy.
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("NumPy not installed")
+        
+        min_e = level.origin_e + np.asarray(cols, dtype=np.float64) * level.tile_extent_m
         max_e = min_e + level.tile_extent_m
-        max_n = level.origin_n - row * level.tile_extent_m
+        max_n = level.origin_n - np.asarray(rows, dtype=np.float64) * level.tile_extent_m
         min_n = max_n - level.tile_extent_m
-        return (min_e, min_n, max_e, max_n)
+        return min_e, min_n, max_e, max_n
     
     def _read_index_entry(self, row: int, col: int,
                           level: LevelInfo) -> Tuple[int, int]:
@@ -263,13 +547,8 @@ class SwtilesReader:
         entry_idx = row * level.grid_cols + col
         entry_offset = level.index_offset + entry_idx * INDEX_ENTRY_SIZE
         
-        self.file.seek(entry_offset)
-        entry = self.file.read(INDEX_ENTRY_SIZE)
-        
-        offset = int.from_bytes(entry[0:5], 'little')
-        length = int.from_bytes(entry[5:8], 'little')
-        
-        return offset, length
+        (entry,) = _ENTRY.unpack_from(self.mm, entry_offset)
+        return entry & 0xFFFFFFFFFF, entry >> 40
     
     def read_tile(self, row: int, col: int,
                   level: Optional[LevelInfo] = None) -> Optional[bytes]:
@@ -282,94 +561,220 @@ class SwtilesReader:
         if length == 0:
             return None
         
-        self.file.seek(level.data_offset + offset)
-        return self.file.read(length)
+        return self._read_data(level.data_offset + offset, length)
+    
+    def _read_data(self, start: int, length: int) -> bytes:
+        """
+        Bytes at an absolute file offset. Small reads are copied straight
+        from the mapping, a few pages of memcpy with no syscall. Larger
+        ones use pread where available: it releases the GIL, so reads
+        issued from worker threads are in flight together, where page
+        faults on the mapping would hold the GIL for the whole copy.
+        """
+        if HAS_PREAD and length > MMAP_READ_MAX:
+            return os.pread(self.file.fileno(), length, start)
+        return self.mm[start:start + length]
     
     def read_tile_as_image(self, row: int, col: int,
-                           level: Optional[LevelInfo] = None) -> Optional['Image.Image']:
-        """Read tile and decode as PIL Image."""
+                           level: Optional[LevelInfo] = None,
+                           draft_size: Optional[int] = None) -> Optional['Image.Image']:
+        """
+        Read tile and decode as PIL Image. The last TILE_CACHE_SIZE decoded
+        tiles are cached and shared between calls, so copy() an image
+        before modifying it in place.
+        
+        For JPEG tiles, draft_size lets the decoder scale down by 1/2, 1/4
+        or 1/8 while decoding, to the smallest size still at least
+        draft_size square. Callers resize the rest of the way.
+        """
         if not HAS_PIL:
             raise RuntimeError("PIL not installed")
         
-        data = self.read_tile(row, col, level)
-        if data is None:
+        if level is None:
+            level = self.get_finest_level()
+        
+        offset, length = self._read_index_entry(row, col, level)
+        if length == 0:
             return None
         
-        return Image.open(io.BytesIO(data))
+        if self.header.image_format != ImageFormat.JPEG:
+            draft_size = None
+        
+        key = (level.data_offset + offset, length, draft_size)
+        with self._tile_cache_lock:
+            img = self._tile_cache.get(key)
+            if img is not None:
+                self._tile_cache.move_to_end(key)
+                return img
+        
+        # Decoded outside the lock, so threads decode concurrently
+        img = Image.open(io.BytesIO(self._read_data(key[0], length)))
+        if draft_size is not None:
+            img.draft('RGB', (draft_size, draft_size))
+        img.load()
+        
+        with self._tile_cache_lock:
+            self._tile_cache[key] = img
+            if len(self._tile_cache) > TILE_CACHE_SIZE:
+                self._tile_cache.popitem(last=False)
+        return img
+    
+    def clear_cache(self):
+        """Drop all cached decoded tiles."""
+        with self._tile_cache_lock:
+            self._tile_cache.clear()
+    
+    def read_tile_as_array(self, row: int, col: int,
+                           level: Optional[LevelInfo] = None) -> Optional['np.ndarray']:
+        """
+        Read tile and decode as an RGB NumPy array. JPEG tiles are decoded
+        by libjpeg-turbo directly when PyTurboJPEG is installed; other
+        formats go through PIL.
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("NumPy not installed")
+        
+        if HAS_TURBOJPEG and self.header.image_format == ImageFormat.JPEG:
+            data = self.read_tile(row, col, level)
+            if data is None:
+                return None
+            return _TURBOJPEG.decode(data, pixel_format=TJPF_RGB)
+        
+        tile_img = self.read_tile_as_image(row, col, level)
+        if tile_img is None:
+            return None
+        if tile_img.mode != 'RGB':
+            tile_img = tile_img.convert('RGB')
+        return np.asarray(tile_img)
     
     def get_tile_coverage(self, level: Optional[LevelInfo] = None,
-                          progress_callback: Optional[Callable[[int, int], None]] = None
+                          progress_callback: Optional[Callable[[int, int], None]] = None,
+                          return_positions: bool = True
                           ) -> CoverageInfo:
         """
         Scan index to find actual tile coverage.
-        Returns CoverageInfo with statistics and list of tile positions.
+        Returns CoverageInfo with statistics and, if return_positions, the
+        list of tile positions. Skipping the list saves memory on large grids.
         """
         if level is None:
             level = self.get_finest_level()
         
-        min_row, max_row = level.grid_rows, 0
-        min_col, max_col = level.grid_cols, 0
-        non_empty_count = 0
-        total_size = 0
-        tile_positions = []
-        
-        self.file.seek(level.index_offset)
-        index_data = self.file.read(level.index_length)
-        
         total_entries = level.grid_rows * level.grid_cols
         
-        for row in range(level.grid_rows):
-            for col in range(level.grid_cols):
-                if progress_callback:
-                    entry_num = row * level.grid_cols + col
-                    if entry_num % 100000 == 0:
-                        progress_callback(entry_num, total_entries)
-                
-                entry_idx = row * level.grid_cols + col
-                entry_offset = entry_idx * INDEX_ENTRY_SIZE
-                
-                offset = int.from_bytes(index_data[entry_offset:entry_offset + 5], 'little')
-                length = int.from_bytes(index_data[entry_offset + 5:entry_offset + 8], 'little')
-                
-                if length > 0:
-                    non_empty_count += 1
-                    total_size += length
-                    min_row = min(min_row, row)
-                    max_row = max(max_row, row)
-                    min_col = min(min_col, col)
-                    max_col = max(max_col, col)
-                    tile_positions.append((row, col))
+        if HAS_NUMPY:
+            if progress_callback:
+                progress_callback(0, total_entries)
+            
+            # Statistics come straight from the arrays, without Python tuples
+            rows, cols, _, lengths = self._non_empty_arrays(level)
+            non_empty_count = len(lengths)
+            total_size = int(lengths.sum())
+            if non_empty_count:
+                min_col, max_col = int(cols.min()), int(cols.max())
+                # Entries are in row-major order, so rows are already sorted
+                min_row, max_row = int(rows[0]), int(rows[-1])
+            if return_positions:
+                rows, cols = rows.astype(np.int32), cols.astype(np.int32)
+        else:
+            rows, cols, _, lengths = self._scan_index(level, progress_callback)
+            non_empty_count = len(lengths)
+            total_size = sum(lengths)
+            if non_empty_count:
+                min_col, max_col = min(cols), max(cols)
+                min_row, max_row = rows[0], rows[-1]
         
         if progress_callback:
             progress_callback(total_entries, total_entries)
         
+        if not return_positions:
+            rows = cols = None
+        
         if non_empty_count == 0:
-            return CoverageInfo(
-                non_empty_count=0,
-                total_size=0,
-                row_range=None,
-                col_range=None,
-                bounds=None,
-                grid_extent=None,
-                tile_positions=[]
-            )
+            return make_coverage(level, 0, 0, None, None, rows, cols)
         
-        bounds = (
-            level.origin_e + min_col * level.tile_extent_m,
-            level.origin_n - (max_row + 1) * level.tile_extent_m,
-            level.origin_e + (max_col + 1) * level.tile_extent_m,
-            level.origin_n - min_row * level.tile_extent_m
-        )
+        return make_coverage(level, non_empty_count, total_size,
+                             (min_row, max_row), (min_col, max_col), rows, cols)
+    
+    def _index_data(self, level: LevelInfo) -> bytes:
+        """
+        A level's whole index, copied out of the mapping once and shared by
+        every scan and bounds query on that level. Used when NumPy is absent;
+        with NumPy, _index_entries views the mapping instead.
+        """
+        index_data = self._index_cache.get(level.index_offset)
+        if index_data is None:
+            self._advise('MADV_SEQUENTIAL', level.index_offset, level.index_length)
+            index_data = self.mm[level.index_offset:level.index_offset + level.index_length]
+            self._index_cache[level.index_offset] = index_data
+        return index_data
+    
+    def _index_entries(self, level: LevelInfo) -> 'np.ndarray':
+        """
+        A level's whole index as a NumPy array of entries, one little-endian
+        u64 per grid slot: 5-byte offset, 3-byte length. The array is a
+        read-only view of the mapping, so nothing is copied and pages are
+        read as the scan touches them. Requires NumPy.
+        """
+        self._advise('MADV_SEQUENTIAL', level.index_offset, level.index_length)
+        return np.frombuffer(self.mm, dtype='<u8', offset=level.index_offset,
+                             count=level.grid_rows * level.grid_cols)
+    
+    def _non_empty_arrays(self, level: LevelInfo) -> Tuple['np.ndarray', ...]:
+        """
+        (rows, cols, offsets, lengths) of a level's non-empty entries as
+        NumPy arrays, in row-major order. Requires NumPy; uses Numba if present.
+        """
+        self._prefetch(level.index_offset, level.index_length)
+        entries = self._index_entries(level)
+        
+        scan_entries = _scan_kernel()
+        if scan_entries is not None:
+            return scan_entries(entries, level.grid_cols, DECODE_THREADS)
+        
+        # Lengths for the whole table in one shift; offsets only where needed
+        lengths = entries >> np.uint64(40)
+        idx = np.flatnonzero(lengths)
+        rows, cols = np.divmod(idx, level.grid_cols)
+        return (rows, cols, entries[idx] & np.uint64(0xFFFFFFFFFF),
+                lengths[idx].astype(np.uint32))
+    
+    def _scan_index(self, level: LevelInfo,
+                    progress_callback: Optional[Callable[[int, int], None]] = None
+                    ) -> Tuple[List[int], List[int], List[int], List[int]]:
+        """
+        Decode a level's whole index. Returns (rows, cols, offsets, lengths)
+        of the non-empty entries, in row-major order.
+        """
+        total_entries = level.grid_rows * level.grid_cols
         
-        return CoverageInfo(
-            non_empty_count=non_empty_count,
-            total_size=total_size,
-            row_range=(min_row, max_row),
-            col_range=(min_col, max_col),
-            bounds=bounds,
-            grid_extent=(max_col - min_col + 1, max_row - min_row + 1),
-            tile_positions=tile_positions
-        )
+        if HAS_NUMPY:
+            if progress_callback:
+                progress_callback(0, total_entries)
+            
+            return tuple(a.tolist() for a in self._non_empty_arrays(level))
+        
+        self._prefetch(level.index_offset, level.index_length)
+        index_data = self._index_data(level)
+        
+        # A Struct specialized to this grid's width decodes a whole index
+        # row per call, so row and column come from the loops, not divmod
+        grid_cols = level.grid_cols
+        row_entries = struct.Struct(f'<{grid_cols}Q')
+        rows_per_report = max(1, 100000 // grid_cols) if grid_cols else 1
+        
+        rows, cols, offsets, lengths = [], [], [], []
+        for row in range(level.grid_rows):
+            if progress_callback and row % rows_per_report == 0:
+                progress_callback(row * grid_cols, total_entries)
+            
+            for col, entry in enumerate(row_entries.unpack_from(index_data, row * row_entries.size)):
+                if entry >> 40:
+                    rows.append(row)
+                    cols.append(col)
+                    offsets.append(entry & 0xFFFFFFFFFF)
+                    lengths.append(entry >> 40)
+        
+        return rows, cols, offsets, lengths
     
     def iter_non_empty_tiles(self, level: Optional[LevelInfo] = None
                              ) -> Iterator[Tuple[int, int, int, int]]:
@@ -377,19 +782,52 @@ class SwtilesReader:
         if level is None:
             level = self.get_finest_level()
         
-        self.file.seek(level.index_offset)
-        index_data = self.file.read(level.index_length)
+        return zip(*self._scan_index(level))
+    
+    def _tile_extents(self, level: LevelInfo, rows: Sequence[int], cols: Sequence[int]
+                      ) -> Tuple[Sequence[int], Sequence[int]]:
+        """
+        (offsets, lengths) of the listed tiles, relative to the level's data
+        region. Looked up with one gather from the index when NumPy is present.
+        """
+        if HAS_NUMPY:
+            slots = np.asarray(rows, dtype=np.int64) * level.grid_cols + np.asarray(cols, dtype=np.int64)
+            entries = self._index_entries(level)[slots]
+            return entries & np.uint64(0xFFFFFFFFFF), entries >> np.uint64(40)
         
-        for row in range(level.grid_rows):
-            for col in range(level.grid_cols):
-                entry_idx = row * level.grid_cols + col
-                entry_offset = entry_idx * INDEX_ENTRY_SIZE
-                
-                offset = int.from_bytes(index_data[entry_offset:entry_offset + 5], 'little')
-                length = int.from_bytes(index_data[entry_offset + 5:entry_offset + 8], 'little')
-                
-                if length > 0:
-                    yield row, col, offset, length
+        extents = [self._read_index_entry(row, col, level) for row, col in zip(rows, cols)]
+        return [offset for offset, _ in extents], [length for _, length in extents]
+    
+    def _file_order(self, level: LevelInfo, offsets: Sequence[int],
+                    lengths: Sequence[int]) -> List[int]:
+        """
+        Order in which to read tiles given by offset and length, so the
+        data region is read front to back. Also hints the kernel to read
+        ahead over the span they cover, and to prefetch it when at least
+        half of the span is tiles to be read, so sparse samples of a large
+        file do not pull in everything between them.
+        """
+        if not len(offsets):
+            return []
+        
+        if HAS_NUMPY:
+            offsets = np.asarray(offsets, dtype=np.int64)
+            lengths = np.asarray(lengths, dtype=np.int64)
+            order = np.argsort(offsets, kind='stable')
+            start = int(offsets[order[0]])
+            end = int((offsets + lengths).max())
+            needed = int(lengths.sum())
+            order = order.tolist()
+        else:
+            order = sorted(range(len(offsets)), key=offsets.__getitem__)
+            start = offsets[order[0]]
+            end = max(offset + length for offset, length in zip(offsets, lengths))
+            needed = sum(lengths)
+        
+        self._advise('MADV_SEQUENTIAL', level.data_offset + start, end - start)
+        if end - start <= 2 * needed:
+            self._prefetch(level.data_offset + start, end - start)
+        return order
     
     def count_tiles_in_bounds(self, bounds: Tuple[float, float, float, float],
                               level: Optional[LevelInfo] = None
@@ -400,33 +838,205 @@ class SwtilesReader:
         
         min_e, min_n, max_e, max_n = bounds
         
-        min_row, _ = self.coord_to_rowcol(min_e, max_n, level)
-        max_row, _ = self.coord_to_rowcol(max_e, min_n, level)
-        _, min_col = self.coord_to_rowcol(min_e, max_n, level)
-        _, max_col = self.coord_to_rowcol(max_e, min_n, level)
+        # Same arithmetic as coord_to_rowcol, one division per edge
+        if HAS_NUMPY:
+            rows, cols = self.coord_to_rowcol_batch((min_e, max_e), (max_n, min_n), level)
+            min_row, max_row = int(rows[0]), int(rows[1])
+            min_col, max_col = int(cols[0]), int(cols[1])
+        else:
+            extent = level.tile_extent_m
+            min_col = int((min_e - level.origin_e) / extent)
+            max_col = int((max_e - level.origin_e) / extent)
+            min_row = int((level.origin_n - max_n) / extent)
+            max_row = int((level.origin_n - min_n) / extent)
         
         min_row = max(0, min_row)
         max_row = min(level.grid_rows - 1, max_row)
         min_col = max(0, min_col)
         max_col = min(level.grid_cols - 1, max_col)
         
-        total = 0
-        non_empty = 0
+        if min_row > max_row or min_col > max_col:
+            return 0, 0
+        
+        num_rows = max_row - min_row + 1
+        num_cols = max_col - min_col + 1
         
-        for row in range(min_row, max_row + 1):
-            for col in range(min_col, max_col + 1):
-                total += 1
-                offset, length = self._read_index_entry(row, col, level)
-                if length > 0:
-                    non_empty += 1
+        if HAS_NUMPY:
+            entries = self._index_entries(level).reshape(level.grid_rows, level.grid_cols)
+            window = entries[min_row:max_row + 1, min_col:max_col + 1]
+            non_empty = int(np.count_nonzero(window >> 40))
+        else:
+            # The rows in bounds are one contiguous run of the index
+            start = min_row * level.grid_cols * INDEX_ENTRY_SIZE
+            band = memoryview(self._index_data(level))[start:start + num_rows * level.grid_cols * INDEX_ENTRY_SIZE]
+            non_empty = 0
+            row_bytes = level.grid_cols * INDEX_ENTRY_SIZE
+            for row_start in range(0, len(band), row_bytes):
+                window = band[row_start + min_col * INDEX_ENTRY_SIZE:
+                              row_start + (max_col + 1) * INDEX_ENTRY_SIZE]
+                non_empty += sum(1 for (entry,) in _ENTRY.iter_unpack(window) if entry >> 40)
+        
+        return num_rows * num_cols, non_empty
+
+
+# ============================================================================
+# Coverage Cache
+# ============================================================================
+
+class CoverageCache:
+    """
+    Coverage scans persisted in a sidecar next to the archive
+    (<file>.cov.npz), so repeated commands on an unchanged file skip the
+    index scan. Entries are keyed by the file's mtime and size and hold
+    each scanned level's tile rows and columns. Requires NumPy; without
+    it every lookup misses and nothing is written.
+    """
+    
+    SUFFIX = '.cov.npz'
+    
+    @staticmethod
+    def sidecar_path(path: Path) -> Path:
+        path = Path(path)
+        return path.with_name(path.name + CoverageCache.SUFFIX)
+    
+    @staticmethod
+    def _stamp(path: Path) -> Tuple[int, int]:
+        st = Path(path).stat()
+        return st.st_mtime_ns, st.st_size
+    
+    @staticmethod
+    def _read(path: Path) -> Dict[str, 'np.ndarray']:
+        """All arrays in the sidecar, or {} if missing, unreadable or stale."""
+        if not HAS_NUMPY:
+            return {}
+        try:
+            with np.load(CoverageCache.sidecar_path(path), allow_pickle=False) as npz:
+                arrays = {key: npz[key] for key in npz.files}
+            stamp = (int(arrays['mtime_ns']), int(arrays['size']))
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return {}
+        return arrays if stamp == CoverageCache._stamp(path) else {}
+    
+    @staticmethod
+    def load(path: Path, level: LevelInfo,
+             return_positions: bool = True) -> Optional[CoverageInfo]:
+        """Cached coverage of a level, or None on a miss."""
+        arrays = CoverageCache._read(path)
+        key = f'L{level.level_id}'
+        if f'{key}_rows' not in arrays:
+            return None
         
-        return total, non_empty
+        rows, cols = arrays[f'{key}_rows'], arrays[f'{key}_cols']
+        count = len(rows)
+        row_range = col_range = None
+        if count:
+            # Rows were stored in row-major scan order, so they are sorted
+            row_range = (int(rows[0]), int(rows[-1]))
+            col_range = (int(cols.min()), int(cols.max()))
+        if not return_positions:
+            rows = cols = None
+        
+        return make_coverage(level, count, int(arrays[f'{key}_total_size']),
+                             row_range, col_range, rows, cols)
+    
+    @staticmethod
+    def save(path: Path, level: LevelInfo, coverage: CoverageInfo,
+             stamp: Optional[Tuple[int, int]] = None):
+        """
+        Store a level's coverage, keeping other levels already cached for
+        the same file. stamp is the (mtime_ns, size) the scan was made
+        against; defaults to the file's current one. Failures to write are
+        ignored, the cache is only an optimization.
+        """
+        if not HAS_NUMPY or coverage.rows is None:
+            return
+        
+        stamp = stamp or CoverageCache._stamp(path)
+        arrays = CoverageCache._read(path)
+        key = f'L{level.level_id}'
+        arrays.update({
+            'mtime_ns': np.int64(stamp[0]),
+            'size': np.int64(stamp[1]),
+            f'{key}_rows': np.asarray(coverage.rows, dtype=np.int32),
+            f'{key}_cols': np.asarray(coverage.cols, dtype=np.int32),
+            f'{key}_total_size': np.int64(coverage.total_size),
+        })
+        
+        sidecar = CoverageCache.sidecar_path(path)
+        tmp = sidecar.with_name(sidecar.name + '.tmp')
+        try:
+            with open(tmp, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, sidecar)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+    
+    @staticmethod
+    def get_or_compute(path: Path, level: LevelInfo,
+                       compute: Callable[[], CoverageInfo],
+                       return_positions: bool = True) -> CoverageInfo:
+        """
+        Cached coverage of a level, or compute() stored for next time.
+        Only results that include tile positions are stored.
+        """
+        coverage = CoverageCache.load(path, level, return_positions)
+        if coverage is not None:
+            return coverage
+        
+        stamp = CoverageCache._stamp(path)
+        coverage = compute()
+        CoverageCache.save(path, level, coverage, stamp)
+        return coverage
 
 
 # ============================================================================
 # Mosaic Generator
 # ============================================================================
 
+def map_batched(pool: Executor, fn, items: list, batch: int = DECODE_BATCH) -> Iterator:
+    """pool.map over `items` in order, submitting at most `batch` at a time."""
+    for start in range(0, len(items), batch):
+        yield from pool.map(fn, items[start:start + batch])
+
+
+def scale_tile(tile_img: 'Image.Image', size: int) -> 'Image.Image':
+    """
+    Scale a tile image to size square. A reduction by a whole factor is a
+    box average with Image.reduce(), several times faster than resampling;
+    other sizes are resampled with LANCZOS. May return tile_img itself.
+    """
+    width, height = tile_img.size
+    if width == height and width % size == 0:
+        factor = width // size
+        return tile_img.reduce(factor) if factor > 1 else tile_img
+    return tile_img.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def decode_tile_data(data: Optional[bytes], output_size: Optional[int] = None,
+                     draft_size: Optional[int] = None):
+    """
+    Decode encoded tile bytes to RGB, resized to output_size square if
+    given: a NumPy array with NumPy, else a PIL Image. draft_size is as
+    for read_tile_as_image and must only be set for JPEG. Module-level so
+    decode processes can run it.
+    """
+    if data is None:
+        return None
+    
+    tile_img = Image.open(io.BytesIO(data))
+    if draft_size is not None:
+        tile_img.draft('RGB', (draft_size, draft_size))
+    if tile_img.mode != 'RGB':
+        tile_img = tile_img.convert('RGB')
+    if output_size is not None:
+        tile_img = scale_tile(tile_img, output_size)
+    
+    return np.asarray(tile_img) if HAS_NUMPY else tile_img
+
+
 class MosaicGenerator:
     """Generate mosaic images from SWTILES."""
     
@@ -435,11 +1045,13 @@ class MosaicGenerator:
         self.debug = debug
     
     def _draw_debug_label(self, img: 'Image.Image', row: int, col: int) -> 'Image.Image':
-        """Draw row/col label on tile for debugging."""
+        """
+        Draw row/col label on tile for debugging. Draws in place, so the
+        image must be one the caller owns, not a cached tile.
+        """
         if not self.debug:
             return img
         
-        img = img.copy()
         draw = ImageDraw.Draw(img)
         
         label = f"r{row}\nc{col}"
@@ -464,12 +1076,14 @@ class MosaicGenerator:
         max_tiles: int = 10000,
         background_color: Tuple[int, int, int] = (64, 64, 64),
         scale: float = 1.0,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        jobs: int = 0
     ) -> Tuple['Image.Image', Dict]:
         """
         Create a spatially correct mosaic from existing tiles.
         
-        Tiles are placed at their correct row/col positions.
+        Tiles are placed at their correct row/col positions. They are
+        decoded on threads, or in `jobs` worker processes if jobs > 0.
         
         Returns:
             Tuple of (PIL Image, debug_info dict)
@@ -480,7 +1094,7 @@ class MosaicGenerator:
         if level is None:
             level = self.reader.get_finest_level()
         
-        if coverage is None:
+        if coverage is None or coverage.rows is None:
             coverage = self.reader.get_tile_coverage(level)
         
         if coverage.non_empty_count == 0:
@@ -525,17 +1139,25 @@ class MosaicGenerator:
         print(f"      Output size: {output_width} × {output_height} px")
         print(f"      Tile size: {output_tile_size} px (scale={scale})")
         
-        # Create output image
-        mosaic = Image.new('RGB', (output_width, output_height), background_color)
-        
-        # Place each tile at its correct position
-        total = len(coverage.tile_positions)
+        # Create output image. With NumPy, tiles are copied into one array
+        # and the image is built from it at the end.
+        if HAS_NUMPY:
+            canvas = np.empty((output_height, output_width, 3), dtype=np.uint8)
+            canvas[...] = background_color
+        else:
+            mosaic = Image.new('RGB', (output_width, output_height), background_color)
         
-        for i, (row, col) in enumerate(coverage.tile_positions):
-            if progress_callback:
-                progress_callback(i + 1, total)
+        def decode(position):
+            row, col = position
             
-            tile_img = self.reader.read_tile_as_image(row, col, level)
+            # Straight to an array when there is nothing to do in PIL
+            if HAS_NUMPY and scale == 1.0 and not self.debug:
+                return self.reader.read_tile_as_array(row, col, level)
+            
+            # Downscaled tiles can be decoded at reduced size to begin with
+            draft_size = output_tile_size if scale < 1.0 else None
+            cached = self.reader.read_tile_as_image(row, col, level, draft_size)
+            tile_img = cached
             
             if tile_img is not None:
                 if tile_img.mode != 'RGB':
@@ -543,32 +1165,104 @@ class MosaicGenerator:
                 
                 # Scale if needed
                 if scale != 1.0:
-                    tile_img = tile_img.resize(
-                        (output_tile_size, output_tile_size),
-                        Image.Resampling.LANCZOS
-                    )
+                    tile_img = scale_tile(tile_img, output_tile_size)
+                
+                if self.debug and tile_img is cached:
+                    # Still the cached image, so label a copy of it
+                    tile_img = tile_img.copy()
                 
                 # Add debug overlay
                 tile_img = self._draw_debug_label(tile_img, row, col)
                 
+                if HAS_NUMPY:
+                    return np.asarray(tile_img)
+            
+            return tile_img
+        
+        def decode_in_processes(pool):
+            # Bytes are read here and sent out; labels are drawn here too
+            decode_data = partial(
+                decode_tile_data,
+                output_size=output_tile_size if scale != 1.0 else None,
+                draft_size=(output_tile_size if scale < 1.0 and
+                            self.reader.header.image_format == ImageFormat.JPEG else None)
+            )
+            batch = 4 * jobs * PROCESS_CHUNK
+            for start in range(0, len(read_positions), batch):
+                chunk = read_positions[start:start + batch]
+                blobs = [self.reader.read_tile(row, col, level) for row, col in chunk]
+                decoded = pool.map(decode_data, blobs, chunksize=PROCESS_CHUNK)
+                
+                for (row, col), tile_img in zip(chunk, decoded):
+                    if tile_img is not None and self.debug:
+                        if HAS_NUMPY:
+                            tile_img = Image.fromarray(tile_img, 'RGB')
+                        tile_img = self._draw_debug_label(tile_img, row, col)
+                        if HAS_NUMPY:
+                            tile_img = np.asarray(tile_img)
+                    yield tile_img
+        
+        # Tiles are read in file order, decoded on worker threads or
+        # processes and pasted here as they come back
+        positions = list(coverage.positions)
+        total = len(positions)
+        offsets, lengths = self.reader._tile_extents(level, coverage.rows, coverage.cols)
+        order = self.reader._file_order(level, offsets, lengths)
+        read_positions = [positions[k] for k in order]
+        placed = [False] * total
+        
+        if jobs > 0:
+            pool = ProcessPoolExecutor(max_workers=jobs)
+            decoded = decode_in_processes(pool)
+        else:
+            pool = ThreadPoolExecutor(max_workers=DECODE_THREADS)
+            decoded = map_batched(pool, decode, read_positions)
+        
+        with pool:
+            
+            for i, (k, tile_img) in enumerate(zip(order, decoded)):
+                if progress_callback:
+                    progress_callback(i + 1, total)
+                
+                if tile_img is None:
+                    continue
+                placed[k] = True
+                
                 # Calculate position: RELATIVE to min_row/min_col
+                row, col = positions[k]
                 x = (col - min_col) * output_tile_size
                 y = (row - min_row) * output_tile_size
                 
-                if self.debug and i < 5:
-                    print(f"      Tile (row={row}, col={col}) → pixel ({x}, {y})")
-                
-                debug_info['tiles_placed'].append({
-                    'row': row,
-                    'col': col,
-                    'x': x,
-                    'y': y
-                })
-                
-                mosaic.paste(tile_img, (x, y))
+                if HAS_NUMPY:
+                    # Clipped at the canvas edge, like paste()
+                    target = canvas[y:y + tile_img.shape[0], x:x + tile_img.shape[1]]
+                    target[...] = tile_img[:target.shape[0], :target.shape[1]]
+                else:
+                    mosaic.paste(tile_img, (x, y))
+        
+        if HAS_NUMPY:
+            mosaic = Image.fromarray(canvas, 'RGB')
+        
+        # Reported in row-major order, like info and debug, not read order
+        tiles_placed = debug_info['tiles_placed']
+        for k, (row, col) in enumerate(positions):
+            if not placed[k]:
+                continue
+            x = (col - min_col) * output_tile_size
+            y = (row - min_row) * output_tile_size
+            
+            if self.debug and len(tiles_placed) < 5:
+                print(f"      Tile (row={row}, col={col}) → pixel ({x}, {y})")
+            
+            tiles_placed.append({
+                'row': row,
+                'col': col,
+                'x': x,
+                'y': y
+            })
         
         if self.debug:
-            print(f"      ... placed {len(debug_info['tiles_placed'])} tiles total")
+            print(f"      ... placed {len(tiles_placed)} tiles total")
         
         return mosaic, debug_info
     
@@ -608,13 +1302,17 @@ class MosaicGenerator:
         output_width = grid_cols * (tile_display_size + 1) + 1
         output_height = grid_rows * (tile_display_size + 1) + 1
         
-        mosaic = Image.new('RGB', (output_width, output_height), border_color)
+        # As in create_spatial_mosaic, with NumPy tiles are copied into one
+        # array and the image is built from it at the end
+        if HAS_NUMPY:
+            canvas = np.empty((output_height, output_width, 3), dtype=np.uint8)
+            canvas[...] = border_color
+        else:
+            mosaic = Image.new('RGB', (output_width, output_height), border_color)
         
-        for i, (row, col, offset, length) in enumerate(sampled):
-            if progress_callback:
-                progress_callback(i + 1, num_samples)
-            
-            tile_img = self.reader.read_tile_as_image(row, col, level)
+        def decode(sample):
+            row, col, offset, length = sample
+            tile_img = self.reader.read_tile_as_image(row, col, level, tile_display_size)
             
             if tile_img is not None:
                 if tile_img.mode != 'RGB':
@@ -627,6 +1325,26 @@ class MosaicGenerator:
                 # Add debug overlay
                 tile_img = self._draw_debug_label(tile_img, row, col)
                 
+                if HAS_NUMPY:
+                    return np.asarray(tile_img)
+            
+            return tile_img
+        
+        # Read in file order on worker threads, so many reads are in
+        # flight at once; i is still the sample's place in the grid
+        order = self.reader._file_order(level, [offset for _, _, offset, _ in sampled],
+                                        [length for _, _, _, length in sampled])
+        
+        with ThreadPoolExecutor(max_workers=DECODE_THREADS) as pool:
+            decoded = map_batched(pool, decode, [sampled[i] for i in order])
+            
+            for n, (i, tile_img) in enumerate(zip(order, decoded)):
+                if progress_callback:
+                    progress_callback(n + 1, num_samples)
+                
+                if tile_img is None:
+                    continue
+                
                 # Grid position (NOT spatial position)
                 grid_row = i // grid_cols
                 grid_col = i % grid_cols
@@ -634,7 +1352,13 @@ class MosaicGenerator:
                 x = grid_col * (tile_display_size + 1) + 1
                 y = grid_row * (tile_display_size + 1) + 1
                 
-                mosaic.paste(tile_img, (x, y))
+                if HAS_NUMPY:
+                    canvas[y:y + tile_display_size, x:x + tile_display_size] = tile_img
+                else:
+                    mosaic.paste(tile_img, (x, y))
+        
+        if HAS_NUMPY:
+            mosaic = Image.fromarray(canvas, 'RGB')
         
         return mosaic
     
@@ -646,7 +1370,10 @@ class MosaicGenerator:
         filled_color: Tuple[int, int, int] = (0, 255, 0),
         progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> 'Image.Image':
-        """Create a coverage map showing which tiles exist."""
+        """
+        Create a coverage map showing which tiles exist, as an RGB image
+        so it can be saved in any format.
+        """
         if not HAS_PIL:
             raise RuntimeError("PIL not installed")
         
@@ -656,33 +1383,40 @@ class MosaicGenerator:
         width = level.grid_cols * scale
         height = level.grid_rows * scale
         
-        img = Image.new('RGB', (width, height), empty_color)
-        pixels = img.load()
-        
         total = level.grid_cols * level.grid_rows
         
-        self.reader.file.seek(level.index_offset)
-        index_data = self.reader.file.read(level.index_length)
-        
-        for row in range(level.grid_rows):
-            for col in range(level.grid_cols):
-                current = row * level.grid_cols + col
-                if progress_callback and current % 50000 == 0:
-                    progress_callback(current, total)
-                
-                entry_idx = row * level.grid_cols + col
-                entry_offset = entry_idx * INDEX_ENTRY_SIZE
-                length = int.from_bytes(
-                    index_data[entry_offset + 5:entry_offset + 8], 'little'
-                )
+        if HAS_NUMPY:
+            if progress_callback:
+                progress_callback(0, total)
+            
+            # One color per tile, looked up from the filled mask, upscaled and
+            # written a band of rows at a time. Progress is reported after
+            # each of COVERAGE_BANDS.
+            self.reader._prefetch(level.index_offset, level.index_length)
+            entries = self.reader._index_entries(level).reshape(level.grid_rows, level.grid_cols)
+            colors = np.array([empty_color, filled_color], dtype=np.uint8)
+            out = np.empty((height, width, 3), dtype=np.uint8)
+            
+            for band in np.array_split(np.arange(level.grid_rows), COVERAGE_BANDS):
+                if not band.size:
+                    continue
+                r0, r1 = int(band[0]), int(band[-1]) + 1
+                cells = colors[((entries[r0:r1] >> 40) != 0).view(np.uint8)]
+                if scale > 1:
+                    cells = cells.repeat(scale, axis=0).repeat(scale, axis=1)
+                out[r0 * scale:r1 * scale] = cells
                 
-                if length > 0:
-                    for dy in range(scale):
-                        for dx in range(scale):
-                            px = col * scale + dx
-                            py = row * scale + dy
-                            if px < width and py < height:
-                                pixels[px, py] = filled_color
+                if progress_callback:
+                    progress_callback(r1 * level.grid_cols, total)
+            
+            img = Image.fromarray(out)
+        else:
+            img = Image.new('RGB', (width, height), empty_color)
+            rows, cols, _, _ = self.reader._scan_index(level, progress_callback)
+            
+            for row, col in zip(rows, cols):
+                img.paste(filled_color, (col * scale, row * scale,
+                                         (col + 1) * scale, (row + 1) * scale))
         
         if progress_callback:
             progress_callback(total, total)
@@ -694,14 +1428,61 @@ class MosaicGenerator:
 # CLI Commands
 # ============================================================================
 
+def save_image(img: 'Image.Image', output: str, png_level: int = 1):
+    """
+    Save an output image in the format its extension names. PNGs are
+    written at zlib level png_level without optimize, since the default
+    level 6 costs several times the CPU for a slightly smaller file.
+    """
+    if Path(output).suffix.lower() == '.png':
+        img.save(output, compress_level=png_level, optimize=False)
+    else:
+        img.save(output)
+
+
+def write_lines(lines: List[str]):
+    """Write buffered report lines to stdout in one call, then clear them."""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
+        lines.clear()
+
+
+def tile_bounds(reader: SwtilesReader, rows: Sequence[int], cols: Sequence[int],
+                level: LevelInfo) -> List[Tuple[float, float, float, float]]:
+    """Bounds of each listed tile, computed in one batch when NumPy is present."""
+    if HAS_NUMPY:
+        return list(zip(*reader.rowcol_to_bounds_batch(rows, cols, level)))
+    return [reader.rowcol_to_bounds(row, col, level) for row, col in zip(rows, cols)]
+
+
+def scan_coverage(args, reader: SwtilesReader, level: LevelInfo,
+                  return_positions: bool = True) -> CoverageInfo:
+    """Scan a level's coverage with a progress bar, via the sidecar cache unless --no-cache."""
+    def scan():
+        bar = ProgressBar("Scanning")
+        coverage = reader.get_tile_coverage(level, progress_callback=bar.update,
+                                            return_positions=return_positions)
+        bar.finish()
+        return coverage
+    
+    if args.no_cache:
+        return scan()
+    return CoverageCache.get_or_compute(args.input, level, scan, return_positions)
+
+
 def cmd_info(args):
     """Show file information including coverage analysis."""
     with SwtilesReader(args.input) as reader:
         h = reader.header
         
-        print(f"\n{'='*60}")
-        print(f"  SWTILES File Information")
-        print(f"{'='*60}")
+        # Report lines are buffered and written in one go before each scan
+        out = []
+        w = out.append
+        
+        w(f"\n{'='*60}")
+        w(f"  SWTILES File Information")
+        w(f"{'='*60}")
         
         file_size = args.input.stat().st_size
         if file_size > 1024 * 1024 * 1024:
@@ -709,60 +1490,62 @@ def cmd_info(args):
         else:
             size_str = f"{file_size / 1024 / 1024:.2f} MB"
         
-        print(f"\n  File: {args.input}")
-        print(f"  Size: {size_str}")
+        w(f"\n  File: {args.input}")
+        w(f"  Size: {size_str}")
         
-        print(f"\n  Header:")
-        print(f"    Version:      {h.version}")
-        print(f"    Data Type:    {h.data_type.name}")
-        print(f"    Image Format: {h.image_format.name}")
-        print(f"    CRS:          EPSG:{h.crs_epsg}")
-        print(f"    Tile Size:    {h.tile_size_px}×{h.tile_size_px} px")
-        print(f"    Num Levels:   {h.num_levels}")
+        w(f"\n  Header:")
+        w(f"    Version:      {h.version}")
+        w(f"    Data Type:    {h.data_type.name}")
+        w(f"    Image Format: {h.image_format.name}")
+        w(f"    CRS:          EPSG:{h.crs_epsg}")
+        w(f"    Tile Size:    {h.tile_size_px}×{h.tile_size_px} px")
+        w(f"    Num Levels:   {h.num_levels}")
         
-        print(f"\n  Declared Bounds:")
-        print(f"    E: {h.bounds_min_e:,.0f} → {h.bounds_max_e:,.0f}")
-        print(f"    N: {h.bounds_min_n:,.0f} → {h.bounds_max_n:,.0f}")
+        w(f"\n  Declared Bounds:")
+        w(f"    E: {h.bounds_min_e:,.0f} → {h.bounds_max_e:,.0f}")
+        w(f"    N: {h.bounds_min_n:,.0f} → {h.bounds_max_n:,.0f}")
         
         for level in reader.levels:
-            print(f"\n  Level {level.level_id}:")
-            print(f"    Resolution:   {level.resolution_m} m/px")
-            print(f"    Tile Extent:  {level.tile_extent_m} m")
-            print(f"    Grid:         {level.grid_cols} × {level.grid_rows}")
-            print(f"    Declared:     {level.tile_count:,} tiles")
-            print(f"    Origin:       ({level.origin_e:,.0f}, {level.origin_n:,.0f})")
+            w(f"\n  Level {level.level_id}:")
+            w(f"    Resolution:   {level.resolution_m} m/px")
+            w(f"    Tile Extent:  {level.tile_extent_m} m")
+            w(f"    Grid:         {level.grid_cols} × {level.grid_rows}")
+            w(f"    Declared:     {level.tile_count:,} tiles")
+            w(f"    Origin:       ({level.origin_e:,.0f}, {level.origin_n:,.0f})")
             
-            print(f"\n    Scanning actual coverage...")
+            w(f"\n    Scanning actual coverage...")
+            write_lines(out)
             
-            bar = ProgressBar("Scanning")
-            coverage = reader.get_tile_coverage(level, progress_callback=bar.update)
-            bar.finish()
+            coverage = scan_coverage(args, reader, level)
             
             if coverage.non_empty_count == 0:
-                print(f"    ⚠ NO TILES FOUND IN FILE!")
+                w(f"    ⚠ NO TILES FOUND IN FILE!")
             else:
-                print(f"    Actual tiles: {coverage.non_empty_count:,}")
-                print(f"    Data size:    {coverage.total_size / 1024 / 1024:.2f} MB")
-                print(f"    Row range:    {coverage.row_range[0]} → {coverage.row_range[1]}")
-                print(f"    Col range:    {coverage.col_range[0]} → {coverage.col_range[1]}")
-                print(f"    Grid extent:  {coverage.grid_extent[0]} × {coverage.grid_extent[1]} tiles")
+                w(f"    Actual tiles: {coverage.non_empty_count:,}")
+                w(f"    Data size:    {coverage.total_size / 1024 / 1024:.2f} MB")
+                w(f"    Row range:    {coverage.row_range[0]} → {coverage.row_range[1]}")
+                w(f"    Col range:    {coverage.col_range[0]} → {coverage.col_range[1]}")
+                w(f"    Grid extent:  {coverage.grid_extent[0]} × {coverage.grid_extent[1]} tiles")
                 
                 # Show first few tile positions
-                print(f"\n    First 10 tile positions (row, col):")
-                for i, (row, col) in enumerate(coverage.tile_positions[:10]):
-                    bounds = reader.rowcol_to_bounds(row, col, level)
-                    print(f"      [{i}] row={row}, col={col} → "
-                          f"E({bounds[0]:.0f}-{bounds[2]:.0f}) N({bounds[1]:.0f}-{bounds[3]:.0f})")
+                w(f"\n    First 10 tile positions (row, col):")
+                rows, cols = coverage.rows[:10], coverage.cols[:10]
+                for i, (row, col, bounds) in enumerate(
+                        zip(rows, cols, tile_bounds(reader, rows, cols, level))):
+                    w(f"      [{i}] row={row}, col={col} → "
+                      f"E({bounds[0]:.0f}-{bounds[2]:.0f}) N({bounds[1]:.0f}-{bounds[3]:.0f})")
                 
-                if len(coverage.tile_positions) > 10:
-                    print(f"      ... and {len(coverage.tile_positions) - 10} more")
+                if coverage.non_empty_count > 10:
+                    w(f"      ... and {coverage.non_empty_count - 10} more")
                 
                 b = coverage.bounds
-                print(f"\n    Actual Bounds (SWEREF 99):")
-                print(f"      E: {b[0]:,.0f} → {b[2]:,.0f}")
-                print(f"      N: {b[1]:,.0f} → {b[3]:,.0f}")
-                print(f"      Width:  {(b[2] - b[0]) / 1000:.1f} km")
-                print(f"      Height: {(b[3] - b[1]) / 1000:.1f} km")
+                w(f"\n    Actual Bounds (SWEREF 99):")
+                w(f"      E: {b[0]:,.0f} → {b[2]:,.0f}")
+                w(f"      N: {b[1]:,.0f} → {b[3]:,.0f}")
+                w(f"      Width:  {(b[2] - b[0]) / 1000:.1f} km")
+                w(f"      Height: {(b[3] - b[1]) / 1000:.1f} km")
+        
+        write_lines(out)
     
     return 0
 
@@ -777,9 +1560,7 @@ def cmd_mosaic(args):
         level = reader.get_finest_level()
         
         print(f"\n  Scanning coverage...")
-        bar = ProgressBar("Scanning")
-        coverage = reader.get_tile_coverage(level, progress_callback=bar.update)
-        bar.finish()
+        coverage = scan_coverage(args, reader, level)
         
         if coverage.non_empty_count == 0:
             print(f"  ✗ No tiles in file!")
@@ -807,12 +1588,13 @@ def cmd_mosaic(args):
             coverage=coverage,
             max_tiles=args.max_tiles,
             scale=args.scale,
-            progress_callback=bar.update
+            progress_callback=bar.update,
+            jobs=args.jobs
         )
         bar.finish()
         
         output = args.output or "mosaic.png"
-        mosaic.save(output)
+        save_image(mosaic, output, args.png_level)
         print(f"\n  ✓ Saved to: {output} ({mosaic.width}×{mosaic.height} px)")
         
         return 0
@@ -828,9 +1610,7 @@ def cmd_overview(args):
         level = reader.get_finest_level()
         
         print(f"\n  Scanning for existing tiles...")
-        bar = ProgressBar("Scanning")
-        coverage = reader.get_tile_coverage(level, progress_callback=bar.update)
-        bar.finish()
+        coverage = scan_coverage(args, reader, level, return_positions=False)
         
         if coverage.non_empty_count == 0:
             print(f"  ✗ No tiles found in file!")
@@ -858,7 +1638,7 @@ def cmd_overview(args):
         bar.finish()
         
         output = args.output or "overview.png"
-        mosaic.save(output)
+        save_image(mosaic, output, args.png_level)
         print(f"\n  ✓ Saved to: {output} ({mosaic.width}×{mosaic.height} px)")
         print(f"\n  Note: This is a sample grid, not a geographic mosaic.")
         print(f"  Use 'mosaic' command for spatially correct output.")
@@ -890,7 +1670,7 @@ def cmd_coverage(args):
         bar.finish()
         
         output = args.output or "coverage.png"
-        coverage_map.save(output)
+        save_image(coverage_map, output, args.png_level)
         print(f"  ✓ Saved to: {output} ({coverage_map.width}×{coverage_map.height} px)")
         
         return 0
@@ -901,19 +1681,6 @@ def cmd_tile(args):
     with SwtilesReader(args.input) as reader:
         level = reader.get_finest_level()
         
-        print(f"\n  Scanning coverage...")
-        bar = ProgressBar("Scanning")
-        coverage = reader.get_tile_coverage(level, progress_callback=bar.update)
-        bar.finish()
-        
-        if coverage.non_empty_count == 0:
-            print(f"  ✗ No tiles in file!")
-            return 1
-        
-        print(f"\n  File has {coverage.non_empty_count:,} tiles")
-        print(f"  Row range: {coverage.row_range[0]} - {coverage.row_range[1]}")
-        print(f"  Col range: {coverage.col_range[0]} - {coverage.col_range[1]}")
-        
         if args.coord:
             easting, northing = args.coord
             row, col = reader.coord_to_rowcol(easting, northing, level)
@@ -921,13 +1688,25 @@ def cmd_tile(args):
         elif args.row is not None and args.col is not None:
             row, col = args.row, args.col
         else:
-            row, col = coverage.tile_positions[0]
+            # Only the default tile needs the whole index scanned
+            print(f"\n  Scanning coverage...")
+            coverage = scan_coverage(args, reader, level)
+            
+            if coverage.non_empty_count == 0:
+                print(f"  ✗ No tiles in file!")
+                return 1
+            
+            print(f"\n  File has {coverage.non_empty_count:,} tiles")
+            print(f"  Row range: {coverage.row_range[0]} - {coverage.row_range[1]}")
+            print(f"  Col range: {coverage.col_range[0]} - {coverage.col_range[1]}")
+            
+            row, col = int(coverage.rows[0]), int(coverage.cols[0])
             print(f"\n  No row/col specified, using first tile at row={row}, col={col}")
         
         print(f"  Reading tile at row={row}, col={col}")
         
+        # One index entry lookup, then one read of the tile's bytes
         tile_data = reader.read_tile(row, col, level)
-        
         if tile_data is None:
             print(f"  ✗ Tile is empty at row={row}, col={col}")
             return 1
@@ -951,85 +1730,107 @@ def cmd_debug(args):
         h = reader.header
         level = reader.get_finest_level()
         
-        print(f"\n{'='*60}")
-        print(f"  SWTILES Debug Report")
-        print(f"{'='*60}")
+        # Report lines are buffered and written in one go around the scan
+        out = []
+        w = out.append
+        
+        w(f"\n{'='*60}")
+        w(f"  SWTILES Debug Report")
+        w(f"{'='*60}")
         
-        print(f"\n  File structure:")
-        print(f"    Header: bytes 0-{HEADER_SIZE-1}")
-        print(f"    Level table: bytes {h.level_table_offset}-{h.level_table_offset + h.num_levels * LEVEL_ENTRY_SIZE - 1}")
-        print(f"    Level 0 index: bytes {level.index_offset}-{level.index_offset + level.index_length - 1}")
-        print(f"    Level 0 data: bytes {level.data_offset}+")
+        w(f"\n  File structure:")
+        w(f"    Header: bytes 0-{HEADER_SIZE-1}")
+        w(f"    Level table: bytes {h.level_table_offset}-{h.level_table_offset + h.num_levels * LEVEL_ENTRY_SIZE - 1}")
+        w(f"    Level 0 index: bytes {level.index_offset}-{level.index_offset + level.index_length - 1}")
+        w(f"    Level 0 data: bytes {level.data_offset}+")
         
-        print(f"\n  Grid parameters:")
-        print(f"    Origin: ({level.origin_e}, {level.origin_n})")
-        print(f"    Tile extent: {level.tile_extent_m} m")
-        print(f"    Grid size: {level.grid_cols} cols × {level.grid_rows} rows")
+        w(f"\n  Grid parameters:")
+        w(f"    Origin: ({level.origin_e}, {level.origin_n})")
+        w(f"    Tile extent: {level.tile_extent_m} m")
+        w(f"    Grid size: {level.grid_cols} cols × {level.grid_rows} rows")
         
-        print(f"\n  Coordinate mapping formula:")
-        print(f"    col = (easting - {level.origin_e}) / {level.tile_extent_m}")
-        print(f"    row = ({level.origin_n} - northing) / {level.tile_extent_m}")
+        w(f"\n  Coordinate mapping formula:")
+        w(f"    col = (easting - {level.origin_e}) / {level.tile_extent_m}")
+        w(f"    row = ({level.origin_n} - northing) / {level.tile_extent_m}")
         
-        print(f"\n  Pixel position formula:")
-        print(f"    x = (col - min_col) * tile_size")
-        print(f"    y = (row - min_row) * tile_size")
+        w(f"\n  Pixel position formula:")
+        w(f"    x = (col - min_col) * tile_size")
+        w(f"    y = (row - min_row) * tile_size")
         
         # Scan and show tiles
-        print(f"\n  Scanning tiles...")
-        bar = ProgressBar("Scanning")
-        coverage = reader.get_tile_coverage(level, progress_callback=bar.update)
-        bar.finish()
+        w(f"\n  Scanning tiles...")
+        write_lines(out)
+        coverage = scan_coverage(args, reader, level)
         
         if coverage.non_empty_count == 0:
-            print(f"\n  ✗ No tiles found!")
+            w(f"\n  ✗ No tiles found!")
+            write_lines(out)
             return 1
         
-        print(f"\n  Coverage summary:")
-        print(f"    Tiles: {coverage.non_empty_count}")
-        print(f"    Row range: {coverage.row_range[0]} → {coverage.row_range[1]}")
-        print(f"    Col range: {coverage.col_range[0]} → {coverage.col_range[1]}")
+        w(f"\n  Coverage summary:")
+        w(f"    Tiles: {coverage.non_empty_count}")
+        w(f"    Row range: {coverage.row_range[0]} → {coverage.row_range[1]}")
+        w(f"    Col range: {coverage.col_range[0]} → {coverage.col_range[1]}")
         
         min_row, max_row = coverage.row_range
         min_col, max_col = coverage.col_range
         
-        print(f"\n  Expected mosaic layout:")
-        print(f"    Top-left tile: row={min_row}, col={min_col} → pixel (0, 0)")
-        print(f"    Bottom-right tile: row={max_row}, col={max_col} → "
-              f"pixel ({(max_col-min_col)*h.tile_size_px}, {(max_row-min_row)*h.tile_size_px})")
-        
-        print(f"\n  First 20 tiles with expected positions:")
         tile_size = h.tile_size_px
-        for i, (row, col) in enumerate(coverage.tile_positions[:20]):
-            x = (col - min_col) * tile_size
-            y = (row - min_row) * tile_size
-            bounds = reader.rowcol_to_bounds(row, col, level)
-            print(f"    [{i:2d}] row={row:4d} col={col:4d} → pixel ({x:5d}, {y:5d}) "
-                  f"| E={bounds[0]:.0f} N={bounds[3]:.0f}")
+        
+        w(f"\n  Expected mosaic layout:")
+        w(f"    Top-left tile: row={min_row}, col={min_col} → pixel (0, 0)")
+        w(f"    Bottom-right tile: row={max_row}, col={max_col} → "
+          f"pixel ({(max_col-min_col)*tile_size}, {(max_row-min_row)*tile_size})")
+        
+        w(f"\n  First 20 tiles with expected positions:")
+        # Pixel positions and bounds are computed up front; the loop only formats
+        rows, cols = coverage.rows[:20], coverage.cols[:20]
+        if HAS_NUMPY:
+            xs = ((cols - min_col).astype(np.int64) * tile_size).tolist()
+            ys = ((rows - min_row).astype(np.int64) * tile_size).tolist()
+        else:
+            xs = [(col - min_col) * tile_size for col in cols]
+            ys = [(row - min_row) * tile_size for row in rows]
+        bounds = tile_bounds(reader, rows, cols, level)
+        for i, (row, col, x, y, (e, _, _, n)) in enumerate(zip(rows, cols, xs, ys, bounds)):
+            w(f"    [{i:2d}] row={row:4d} col={col:4d} → pixel ({x:5d}, {y:5d}) "
+              f"| E={e:.0f} N={n:.0f}")
         
         # Check for gaps
-        print(f"\n  Checking for contiguity...")
-        tile_set = set(coverage.tile_positions)
+        w(f"\n  Checking for contiguity...")
         expected = (max_row - min_row + 1) * (max_col - min_col + 1)
-        actual = len(tile_set)
+        if HAS_NUMPY:
+            # One bool per cell of the bounding box
+            grid = np.zeros((max_row - min_row + 1, max_col - min_col + 1), dtype=bool)
+            grid[coverage.rows - min_row, coverage.cols - min_col] = True
+            actual = int(grid.sum())
+        else:
+            tile_set = set(coverage.positions)
+            actual = len(tile_set)
         
         if actual == expected:
-            print(f"    ✓ Perfect coverage: {actual} tiles fill the bounding box")
+            w(f"    ✓ Perfect coverage: {actual} tiles fill the bounding box")
         else:
             missing = expected - actual
-            print(f"    ⚠ Sparse coverage: {actual}/{expected} cells filled ({missing} gaps)")
+            w(f"    ⚠ Sparse coverage: {actual}/{expected} cells filled ({missing} gaps)")
             
             # Show some gaps
-            gaps = []
-            for r in range(min_row, min(min_row + 5, max_row + 1)):
-                for c in range(min_col, min(min_col + 10, max_col + 1)):
-                    if (r, c) not in tile_set:
-                        gaps.append((r, c))
+            if HAS_NUMPY:
+                gaps = [(min_row + int(r), min_col + int(c))
+                        for r, c in np.argwhere(~grid[:5, :10])]
+            else:
+                gaps = []
+                for r in range(min_row, min(min_row + 5, max_row + 1)):
+                    for c in range(min_col, min(min_col + 10, max_col + 1)):
+                        if (r, c) not in tile_set:
+                            gaps.append((r, c))
             
             if gaps:
-                print(f"    First gaps in top-left region:")
+                w(f"    First gaps in top-left region:")
                 for r, c in gaps[:10]:
-                    print(f"      Missing: row={r}, col={c}")
+                    w(f"      Missing: row={r}, col={c}")
         
+        write_lines(out)
         return 0
 
 
@@ -1068,21 +1869,29 @@ Examples:
     # Info command
     p_info = subparsers.add_parser('info', help='Show file information')
     p_info.add_argument('input', type=Path, help='Input SWTILES file')
+    p_info.add_argument('--no-cache', action='store_true',
+                        help='Rescan the index instead of using the .cov.npz sidecar')
     
     # Debug command
     p_debug = subparsers.add_parser('debug', help='Debug tile positions')
     p_debug.add_argument('input', type=Path, help='Input SWTILES file')
+    p_debug.add_argument('--no-cache', action='store_true',
+                         help='Rescan the index instead of using the .cov.npz sidecar')
     
     # Coverage command
     p_coverage = subparsers.add_parser('coverage', help='Generate coverage map')
     p_coverage.add_argument('input', type=Path, help='Input SWTILES file')
     p_coverage.add_argument('--scale', type=int, default=1,
                             help='Pixels per tile (default: 1)')
+    p_coverage.add_argument('--png-level', type=int, default=1, choices=range(10),
+                            metavar='0-9', help='PNG compression level (default: 1)')
     p_coverage.add_argument('-o', '--output', help='Output filename')
     
     # Tile command
     p_tile = subparsers.add_parser('tile', help='Extract single tile')
     p_tile.add_argument('input', type=Path, help='Input SWTILES file')
+    p_tile.add_argument('--no-cache', action='store_true',
+                        help='Rescan the index instead of using the .cov.npz sidecar')
     p_tile.add_argument('--row', type=int, help='Tile row')
     p_tile.add_argument('--col', type=int, help='Tile column')
     p_tile.add_argument('--coord', type=float, nargs=2, metavar=('E', 'N'),
@@ -1092,24 +1901,34 @@ Examples:
     # Mosaic command
     p_mosaic = subparsers.add_parser('mosaic', help='Create spatially correct mosaic')
     p_mosaic.add_argument('input', type=Path, help='Input SWTILES file')
+    p_mosaic.add_argument('--no-cache', action='store_true',
+                          help='Rescan the index instead of using the .cov.npz sidecar')
     p_mosaic.add_argument('--max-tiles', type=int, default=10000,
                           help='Maximum tiles (default: 10000)')
     p_mosaic.add_argument('--scale', type=float, default=1.0,
                           help='Scale factor (default: 1.0)')
     p_mosaic.add_argument('--debug', action='store_true',
                           help='Draw row/col labels on tiles')
+    p_mosaic.add_argument('--jobs', type=int, default=0,
+                          help='Decode tiles in N processes (default: 0, use threads)')
+    p_mosaic.add_argument('--png-level', type=int, default=1, choices=range(10),
+                          metavar='0-9', help='PNG compression level (default: 1)')
     p_mosaic.add_argument('-o', '--output', help='Output filename')
     
     # Overview command
     p_overview = subparsers.add_parser('overview',
                                         help='Create sampled overview grid')
     p_overview.add_argument('input', type=Path, help='Input SWTILES file')
+    p_overview.add_argument('--no-cache', action='store_true',
+                            help='Rescan the index instead of using the .cov.npz sidecar')
     p_overview.add_argument('--grid', type=int, nargs=2, default=[20, 20],
                             metavar=('COLS', 'ROWS'), help='Grid size')
     p_overview.add_argument('--thumb-size', type=int, default=100,
                             help='Thumbnail size (default: 100)')
     p_overview.add_argument('--debug', action='store_true',
                             help='Draw row/col labels on tiles')
+    p_overview.add_argument('--png-level', type=int, default=1, choices=range(10),
+                            metavar='0-9', help='PNG compression level (default: 1)')
     p_overview.add_argument('-o', '--output', help='Output filename')
     
     args = parser.parse_args()
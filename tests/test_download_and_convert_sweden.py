@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+for _mod in ("requests", "rasterio", "dotenv", "tqdm"):
+    pytest.importorskip(_mod)
+
+import download_and_convert_sweden as dcs
+
+
+def _heights(nodata=None):
+    rng = np.random.default_rng(0)
+    h = rng.uniform(-200.0, 2200.0, size=(300, 257)).astype(np.float32)
+    # Values around both clamp limits
+    h[0, :8] = [-10001.0, -10000.0, -9999.95, 0.0, 1677711.5, 1677721.5, 1677722.0, 1e9]
+    if nodata is not None:
+        h[::7, ::5] = nodata
+    return h
+
+
+@pytest.mark.parametrize("nodata", [None, -9999.0, -32767.0])
+def test_scale_heights_jit_matches_numpy(nodata):
+    if not dcs.HAS_NUMBA:
+        pytest.skip("numba not installed")
+    src = _heights(nodata)
+    expected = np.empty(src.shape, dtype=np.uint32)
+    actual = np.empty(src.shape, dtype=np.uint32)
+
+    dcs._scale_heights_numpy(src, nodata, expected)
+    has_nodata = nodata is not None
+    dcs._scale_heights_jit(src, has_nodata, np.float32(nodata) if has_nodata else np.float32(0), actual)
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_scale_heights_nodata_maps_to_zero():
+    src = _heights(-9999.0)
+    out = dcs.scale_heights(src, -9999.0, np.empty(src.shape, dtype=np.uint32))
+
+    assert (out[::7, ::5] == 0).all()
+    assert out[1, 1] == np.uint32((src[1, 1] + np.float32(10000)) * np.float32(10))
@@ -0,0 +1,75 @@
+import pytest
+
+pytest.importorskip("tqdm")
+
+import resize_tiles
+
+
+def _write_vrt(path, bands=3, sources=2):
+    band_xml = []
+    for b in range(1, bands + 1):
+        srcs = "".join(
+            f"""
+        <SimpleSource>
+            <SourceFilename relativeToVRT="1">b{b}_s{i}.tif</SourceFilename>
+            <SourceBand>{b}</SourceBand>
+            <DstRect xOff="{i * 100}" yOff="0" xSize="100" ySize="100" />
+        </SimpleSource>"""
+            for i in range(sources)
+        )
+        band_xml.append(
+            f"""
+    <VRTRasterBand dataType="Byte" band="{b}">
+        <ColorInterp>{('Red', 'Green', 'Blue')[(b - 1) % 3]}</ColorInterp>{srcs}
+    </VRTRasterBand>"""
+        )
+    path.write_text(
+        f"""<VRTDataset rasterXSize="{sources * 100}" rasterYSize="100">
+    <SRS>EPSG:3006</SRS>
+    <GeoTransform>0, 1, 0, 0, 0, -1</GeoTransform>{''.join(band_xml)}
+</VRTDataset>
+"""
+    )
+
+
+def test_iter_vrt_sources_reads_first_band_only(tmp_path):
+    vrt = tmp_path / "mosaik.vrt"
+    _write_vrt(vrt, bands=3, sources=2)
+
+    header = {}
+    sources = list(resize_tiles.iter_vrt_sources(str(vrt), header))
+
+    assert sources == [
+        ("b1_s0.tif", {"xOff": "0", "yOff": "0", "xSize": "100", "ySize": "100"}),
+        ("b1_s1.tif", {"xOff": "100", "yOff": "0", "xSize": "100", "ySize": "100"}),
+    ]
+    assert header["dataType"] == "Byte"
+    assert header["ColorInterp"].text == "Red"
+    assert header["root"].find("GeoTransform") is not None
+
+
+def test_iter_vrt_sources_single_band(tmp_path):
+    vrt = tmp_path / "mosaik.vrt"
+    _write_vrt(vrt, bands=1, sources=3)
+
+    header = {}
+    names = [name for name, _ in resize_tiles.iter_vrt_sources(str(vrt), header)]
+
+    assert names == ["b1_s0.tif", "b1_s1.tif", "b1_s2.tif"]
+
+
+def test_iter_vrt_sources_closes_file_after_first_band(tmp_path, monkeypatch):
+    vrt = tmp_path / "mosaik.vrt"
+    _write_vrt(vrt, bands=3, sources=2)
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        f = open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    monkeypatch.setattr(resize_tiles, "open", tracking_open, raising=False)
+    list(resize_tiles.iter_vrt_sources(str(vrt), {}))
+
+    assert len(opened) == 1
+    assert opened[0].closed
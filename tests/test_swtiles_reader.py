@@ -0,0 +1,178 @@
+import gc
+import subprocess
+import sys
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import swtiles_reader
+from swtiles_reader import SwtilesReader
+
+REPO = Path(__file__).resolve().parent.parent
+TILE = 20
+GRID_ROWS, GRID_COLS = 7, 9
+
+
+def _has_source(row, col):
+    return (row * 5 + col * 3) % 4 != 0
+
+
+TILE_COUNT = sum(_has_source(r, c) for r in range(GRID_ROWS) for c in range(GRID_COLS))
+
+
+@pytest.fixture(scope="module")
+def archive(tmp_path_factory):
+    """A small single-level archive written by swtile_writer.py, with some empty slots."""
+    root = tmp_path_factory.mktemp("mosaic")
+    sources = []
+    for r in range(GRID_ROWS):
+        for c in range(GRID_COLS):
+            if not _has_source(r, c):
+                continue
+            name = f"t_{r}_{c}.png"
+            Image.new("RGB", (TILE, TILE), (r * 30, c * 25, 90)).save(root / name)
+            sources.append((name, c * TILE, r * TILE))
+
+    band = "".join(
+        f"""
+    <SimpleSource>
+      <SourceFilename relativeToVRT="1">{name}</SourceFilename>
+      <SourceBand>1</SourceBand>
+      <DstRect xOff="{x}" yOff="{y}" xSize="{TILE}" ySize="{TILE}"/>
+    </SimpleSource>"""
+        for name, x, y in sources
+    )
+    vrt = root / "mosaik.vrt"
+    vrt.write_text(
+        f"""<VRTDataset rasterXSize="{GRID_COLS * TILE}" rasterYSize="{GRID_ROWS * TILE}">
+  <SRS>PROJCS["SWEREF99 TM",AUTHORITY["EPSG","3006"]]</SRS>
+  <GeoTransform>266000.0, 1.0, 0.0, 7700000.0, 0.0, -1.0</GeoTransform>
+  <VRTRasterBand dataType="Byte" band="1">{band}
+  </VRTRasterBand>
+</VRTDataset>
+"""
+    )
+
+    out = root / "test.swtiles"
+    subprocess.run(
+        [sys.executable, str(REPO / "swtile_writer.py"), str(vrt), str(out),
+         "--tile-size", str(TILE)],
+        check=True, capture_output=True,
+    )
+    return out
+
+
+def test_coord_to_rowcol_batch_matches_scalar(archive):
+    with SwtilesReader(archive) as reader:
+        level = reader.get_finest_level()
+        rng = np.random.default_rng(0)
+        eastings = level.origin_e + rng.uniform(-30.0, GRID_COLS * TILE + 30.0, 500)
+        northings = level.origin_n - rng.uniform(-30.0, GRID_ROWS * TILE + 30.0, 500)
+        # Exact tile edges, where truncation matters most
+        eastings[:GRID_COLS] = level.origin_e + np.arange(GRID_COLS) * level.tile_extent_m
+        northings[:GRID_ROWS] = level.origin_n - np.arange(GRID_ROWS) * level.tile_extent_m
+
+        rows, cols = reader.coord_to_rowcol_batch(eastings, northings, level)
+
+        expected = [reader.coord_to_rowcol(e, n, level) for e, n in zip(eastings, northings)]
+        assert list(zip(rows.tolist(), cols.tolist())) == expected
+
+
+def test_count_tiles_in_bounds_without_numpy(archive, monkeypatch):
+    with SwtilesReader(archive) as reader:
+        level = reader.get_finest_level()
+        e0, n0 = level.origin_e, level.origin_n
+        boxes = [
+            (e0 + 5, n0 - 95, e0 + 75, n0 - 15),
+            (e0 - 100, n0 - 1000, e0 + 1000, n0 + 100),
+            (e0 + 200, n0 - 20, e0 + 1000, n0),
+        ]
+        with_numpy = [reader.count_tiles_in_bounds(b, level) for b in boxes]
+        monkeypatch.setattr(swtiles_reader, "HAS_NUMPY", False)
+        without_numpy = [reader.count_tiles_in_bounds(b, level) for b in boxes]
+
+    assert with_numpy == without_numpy
+    assert with_numpy[1] == (GRID_ROWS * GRID_COLS, TILE_COUNT)
+
+
+def test_coverage_map_saves_as_jpeg(archive, tmp_path):
+    out = tmp_path / "map.jpg"
+    subprocess.run(
+        [sys.executable, str(REPO / "swtiles_reader.py"), "coverage", str(archive),
+         "-o", str(out), "--scale", "3"],
+        check=True, capture_output=True,
+    )
+
+    with Image.open(out) as img:
+        assert img.format == "JPEG"
+        assert img.size == (GRID_COLS * 3, GRID_ROWS * 3)
+
+
+def test_coverage_map_matches_without_numpy(archive, monkeypatch):
+    with SwtilesReader(archive) as reader:
+        generator = swtiles_reader.MosaicGenerator(reader)
+        with_numpy = generator.create_coverage_map(scale=2)
+        monkeypatch.setattr(swtiles_reader, "HAS_NUMPY", False)
+        without_numpy = generator.create_coverage_map(scale=2)
+
+    assert with_numpy.mode == without_numpy.mode == "RGB"
+    assert with_numpy.tobytes() == without_numpy.tobytes()
+    # Top-left pixel of each tile cell
+    for r in range(GRID_ROWS):
+        for c in range(GRID_COLS):
+            expected = (0, 255, 0) if _has_source(r, c) else (32, 32, 32)
+            assert with_numpy.getpixel((c * 2, r * 2)) == expected
+
+
+def test_rowcol_to_bounds_matches_batch(archive):
+    with SwtilesReader(archive) as reader:
+        level = reader.get_finest_level()
+        rows = [r for r in range(GRID_ROWS) for _ in range(GRID_COLS)]
+        cols = [c for _ in range(GRID_ROWS) for c in range(GRID_COLS)]
+        batch = list(zip(*reader.rowcol_to_bounds_batch(rows, cols, level)))
+        # Twice, so the second pass is served from the cache
+        for _ in range(2):
+            assert [reader.rowcol_to_bounds(r, c, level) for r, c in zip(rows, cols)] == batch
+
+
+def test_reader_is_freed_without_the_cycle_collector(archive):
+    gc.disable()
+    try:
+        reader = SwtilesReader(archive)
+        level = reader.get_finest_level()
+        reader.rowcol_to_bounds(1, 2, level)
+        ref = weakref.ref(reader)
+        reader.close()
+        del reader
+        assert ref() is None
+    finally:
+        gc.enable()
+
+
+def test_mosaic_reports_tiles_in_row_major_order(archive, monkeypatch, capsys):
+    with SwtilesReader(archive) as reader:
+        expected = swtiles_reader.MosaicGenerator(reader).create_spatial_mosaic()[0]
+        # Read back to front, as if the file held the tiles in reverse
+        file_order = reader._file_order
+        monkeypatch.setattr(reader, "_file_order",
+                            lambda *args: list(reversed(file_order(*args))))
+        mosaic = swtiles_reader.MosaicGenerator(reader).create_spatial_mosaic()[0]
+        capsys.readouterr()
+        _, debug_info = swtiles_reader.MosaicGenerator(reader, debug=True).create_spatial_mosaic()
+
+    assert mosaic.tobytes() == expected.tobytes()
+
+    tiles_placed = debug_info['tiles_placed']
+    placed = [(t['row'], t['col']) for t in tiles_placed]
+    assert placed == sorted(placed)
+    assert len(placed) == TILE_COUNT
+
+    printed = [line.strip() for line in capsys.readouterr().out.splitlines()
+               if line.strip().startswith("Tile (row=")]
+    assert printed == [
+        f"Tile (row={t['row']}, col={t['col']}) → pixel ({t['x']}, {t['y']})"
+        for t in tiles_placed[:5]
+    ]